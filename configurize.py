@@ -36,12 +36,25 @@ def configurize(Meta, parameterization):
 
 
 
+        # The key is resolved only once since we'll
+        # need both its value and its database entry.
+
+        mcu = MCUS[parameterization.mcu]
+
+        handle = mcu.handle(
+            given_key,
+            must_hold_value = value is ...,
+            undefined_ok    = False,
+        )
+
+
+
         # We'll use the value that has been determined
         # by the parameterization if the caller didn't
         # give anything specific.
 
         if value is ...:
-            value = parameterization(given_key)
+            value = parameterization(handle)
 
 
 
@@ -64,11 +77,12 @@ def configurize(Meta, parameterization):
         # Give the caller the peripheral-register-field-value tuple.
 
         value = pxd.c_repr(value)
+        entry = mcu[handle]
 
-        if MCUS[parameterization.mcu][given_key].off_by_one:
+        if entry.off_by_one:
             value = f'{value} - 1'
 
-        return (*MCUS[parameterization.mcu][given_key].location, value)
+        return (*entry.location, value)
 
 
 
@@ -84,11 +98,19 @@ def configurize(Meta, parameterization):
 
         # If value is indeterminate, so we won't make a macro.
 
-        value = parameterization(
+        mcu = MCUS[parameterization.mcu]
+
+        handle = mcu.handle(
             given_key,
-            when_undefined = TBD if undefined_ok else ...
+            must_hold_value = True,
+            undefined_ok    = undefined_ok,
         )
 
+        if handle is None:
+            return
+
+        value = parameterization(handle)
+
         if value is TBD:
             return
 
@@ -98,7 +120,7 @@ def configurize(Meta, parameterization):
 
         value = pxd.c_repr(value)
 
-        if MCUS[parameterization.mcu][given_key].off_by_one:
+        if mcu[handle].off_by_one:
             value = f'({value} - 1)'
 
         Meta.define(f'STPY_{given_key}', value)
@@ -379,6 +401,27 @@ def configurize(Meta, parameterization):
     # this delay varies based on voltage and clock frequency.
     # @/pg 210/sec 5.3.7/`H7S3rm`.
     #
+    # The clock tree isn't switched over until later, so for now, the flash
+    # is given the most wait-states it could ever need; it gets brought down
+    # to what's actually needed once the system clock has been switched over.
+    #
+
+
+
+    maximum_flash_latency = max(
+        len(maximum_frequencies) - 1
+        for maximum_frequencies in parameterization('FLASH_LATENCY_TABLE').values()
+    )
+
+    maximum_flash_settings = (
+        tuplize('FLASH_LATENCY'          , maximum_flash_latency),
+        tuplize('FLASH_PROGRAMMING_DELAY', parameterization('FLASH_PROGRAMMING_DELAY_TABLE')[maximum_flash_latency]),
+    )
+
+    flash_settings = (
+        tuplize('FLASH_LATENCY'          ),
+        tuplize('FLASH_PROGRAMMING_DELAY'),
+    )
 
 
 
@@ -388,19 +431,13 @@ def configurize(Meta, parameterization):
 
         # Set the wait-states.
 
-        CMSIS_SET(
-            tuplize('FLASH_LATENCY'          ),
-            tuplize('FLASH_PROGRAMMING_DELAY'),
-        )
+        CMSIS_SET(*maximum_flash_settings)
 
 
 
         # Ensure the new number of wait-states is taken into account.
 
-        CMSIS_SPINLOCK(
-            tuplize('FLASH_LATENCY'          ),
-            tuplize('FLASH_PROGRAMMING_DELAY'),
-        )
+        CMSIS_SPINLOCK(*maximum_flash_settings)
 
 
 
@@ -438,6 +475,8 @@ def configurize(Meta, parameterization):
         # A higher core voltage means higher power consumption,
         # but better performance in terms of max clock speed.
 
+        define_if_determined('INTERNAL_VOLTAGE_SCALING')
+
         CMSIS_SET(tuplize('INTERNAL_VOLTAGE_SCALING'))
 
 
@@ -639,6 +678,34 @@ def configurize(Meta, parameterization):
 
 
 
+    ################################################################################
+    #
+    # Flash (Continued).
+    #
+    # Now that the system clock is at its final frequency,
+    # the flash can use the fewest wait-states it can get away with.
+    #
+
+
+
+    if flash_settings != maximum_flash_settings:
+
+        with Meta.section(title_of('Flash (Continued)')):
+
+
+
+            # Set the wait-states.
+
+            CMSIS_SET(*flash_settings)
+
+
+
+            # Ensure the new number of wait-states is taken into account.
+
+            CMSIS_SPINLOCK(*flash_settings)
+
+
+
     ################################################################################
     #
     # SysTick.
@@ -680,7 +747,10 @@ def configurize(Meta, parameterization):
                 define_if_determined(f'{peripheral}{unit}_KERNEL_SOURCE')
 
             for peripheral, unit in instances:
+                define_if_determined(f'{peripheral}{unit}_PRESC'       )
+                define_if_determined(f'{peripheral}{unit}_OVERSAMPLING')
                 define_if_determined(f'{peripheral}{unit}_BAUD_DIVIDER')
+                define_if_determined(f'{peripheral}{unit}_BAUD_ERROR'  )
 
 
 
@@ -699,6 +769,8 @@ def configurize(Meta, parameterization):
             define_if_determined(f'I2C{unit}_PRESC'            )
             define_if_determined(f'I2C{unit}_SCLH'             )
             define_if_determined(f'I2C{unit}_SCLL'             )
+            define_if_determined(f'I2C{unit}_SCLDEL'           )
+            define_if_determined(f'I2C{unit}_SDADEL'           )
             define_if_determined(f'I2C{unit}_TIMEOUTR_TIMEOUTA')
 
 
@@ -1,1549 +1,8 @@
-global APBS
-APBS = (
-    1,
-    2,
-    3,
-)
+extend('STM32H533')
 
 
 
-global PLLS
-PLLS = (
-    (1, ('P', 'Q', 'R')),
-    (2, ('P', 'Q', 'R')),
-    (3, ('P', 'Q', 'R')),
-)
+# Package: LQFP64.
 
-
-global GPIO_MAX_PIN_NUMBER
-GPIO_MAX_PIN_NUMBER = 16
-
-global GPIOS
-GPIOS = tuple((port, tuple(range(GPIO_MAX_PIN_NUMBER))) for port in 'ABCDEFGHI')
-
-
-
-global UXARTS
-UXARTS = (
-    (('USART', 1),),
-    (('USART', 2),),
-    (('USART', 3),),
-    (('UART' , 4),),
-    (('UART' , 5),),
-    (('USART', 6),),
-)
-
-
-
-global I2CS
-I2CS = (
-    1,
-    2,
-    3,
-)
-
-
-
-global SPIS
-SPIS = (
-    1,
-    2,
-    3,
-    4,
-)
-
-
-
-global TIMERS
-TIMERS = (
-    1,
-    2,
-    3,
-    4,
-    5,
-    6,
-    7,
-    8,
-    12,
-    15,
-)
-
-
-
-global SDMMCS
-SDMMCS = (
-    1,
-)
-
-
-global INTERRUPTS
-INTERRUPTS = (
-    'Reset',
-    'NonMaskableInt',
-    'HardFault',
-    'MemoryManagement',
-    'BusFault',
-    'UsageFault',
-    'SecureFault',
-    None,
-    None,
-    None,
-    'SVCall',
-    'DebugMonitor',
-    None,
-    'PendSV',
-    'SysTick',
-    'WWDG',
-    'PVD_AVD',
-    'RTC',
-    'RTC_S',
-    'TAMP',
-    'RAMCFG',
-    'FLASH',
-    'FLASH_S',
-    'GTZC',
-    'RCC',
-    'RCC_S',
-    'EXTI0',
-    'EXTI1',
-    'EXTI2',
-    'EXTI3',
-    'EXTI4',
-    'EXTI5',
-    'EXTI6',
-    'EXTI7',
-    'EXTI8',
-    'EXTI9',
-    'EXTI10',
-    'EXTI11',
-    'EXTI12',
-    'EXTI13',
-    'EXTI14',
-    'EXTI15',
-    'GPDMA1_Channel0',
-    'GPDMA1_Channel1',
-    'GPDMA1_Channel2',
-    'GPDMA1_Channel3',
-    'GPDMA1_Channel4',
-    'GPDMA1_Channel5',
-    'GPDMA1_Channel6',
-    'GPDMA1_Channel7',
-    'IWDG',
-    'SAES',
-    'ADC1',
-    'DAC1',
-    'FDCAN1_IT0',
-    'FDCAN1_IT1',
-    'TIM1_BRK',
-    'TIM1_UP',
-    'TIM1_TRG_COM',
-    'TIM1_CC',
-    'TIM2',
-    'TIM3',
-    'TIM4',
-    'TIM5',
-    'TIM6',
-    'TIM7',
-    'I2C1_EV',
-    'I2C1_ER',
-    'I2C2_EV',
-    'I2C2_ER',
-    'SPI1',
-    'SPI2',
-    'SPI3',
-    'USART1',
-    'USART2',
-    'USART3',
-    'UART4',
-    'UART5',
-    'LPUART1',
-    'LPTIM1',
-    'TIM8_BRK',
-    'TIM8_UP',
-    'TIM8_TRG_COM',
-    'TIM8_CC',
-    'ADC2',
-    'LPTIM2',
-    'TIM15',
-    None,
-    None,
-    'USB_DRD_FS',
-    'CRS',
-    'UCPD1',
-    'FMC',
-    'OCTOSPI1',
-    'SDMMC1',
-    'I2C3_EV',
-    'I2C3_ER',
-    'SPI4',
-    None,
-    None,
-    'USART6',
-    None,
-    None,
-    None,
-    None,
-    'GPDMA2_Channel0',
-    'GPDMA2_Channel1',
-    'GPDMA2_Channel2',
-    'GPDMA2_Channel3',
-    'GPDMA2_Channel4',
-    'GPDMA2_Channel5',
-    'GPDMA2_Channel6',
-    'GPDMA2_Channel7',
-    None,
-    None,
-    None,
-    None,
-    None,
-    'FPU',
-    'ICACHE',
-    'DCACHE1',
-    None,
-    None,
-    'DCMI_PSSI',
-    'FDCAN2_IT0',
-    'FDCAN2_IT1',
-    None,
-    None,
-    'DTS',
-    'RNG',
-    'OTFDEC1',
-    'AES',
-    'HASH',
-    'PKA',
-    'CEC',
-    'TIM12',
-    None,
-    None,
-    'I3C1_EV',
-    'I3C1_ER',
-    None,
-    None,
-    None,
-    None,
-    None,
-    None,
-    'I3C2_EV',
-    'I3C2_ER',
-)
-
-
-
-global PLL_CHANNEL_FREQ
-PLL_CHANNEL_FREQ = RealMinMax(1_000_000, 250_000_000)
-
-
-
-global CPU_FREQ
-CPU_FREQ = RealMinMax(0, 250_000_000)
-
-
-
-global AXI_AHB_FREQ
-AXI_AHB_FREQ = RealMinMax(0, 250_000_000)
-
-
-
-global APB_FREQ
-APB_FREQ = RealMinMax(0, 250_000_000)
-
-
-
-global HSI_DEFAULT_FREQUENCY
-HSI_DEFAULT_FREQUENCY = 32_000_000
-
-
-
-global APB_PERIPHERALS
-APB_PERIPHERALS = {
-    'TIM1'  : 2,
-    'TIM2'  : 1,
-    'TIM3'  : 1,
-    'TIM4'  : 1,
-    'TIM5'  : 1,
-    'TIM6'  : 1,
-    'TIM7'  : 1,
-    'TIM8'  : 2,
-    'TIM12' : 1,
-    'TIM15' : 2,
-}
-
-
-
-global GLOBAL_TIMER_PRESCALER_MULTIPLIER_TABLE
-GLOBAL_TIMER_PRESCALER_MULTIPLIER_TABLE = {
-    (False, 1 ) : 1,
-    (False, 2 ) : 1,
-    (False, 4 ) : 1 / 2,
-    (False, 8 ) : 1 / 4,
-    (False, 16) : 1 / 8,
-    (True , 1 ) : 1,
-    (True , 2 ) : 1,
-    (True , 4 ) : 1 / 2,
-    (True , 8 ) : 1 / 2,
-    (True , 16) : 1 / 4,
-}
-
-
-
-UXART_KERNEL_SOURCE_TABLE = (
-    (
-        (
-            ('USART10SEL', (('USART', 10),)),
-            ('UART9SEL'  , (('UART' , 9 ),)),
-            ('UART8SEL'  , (('UART' , 8 ),)),
-            ('UART7SEL'  , (('UART' , 7 ),)),
-            ('USART6SEL' , (('USART', 6 ),)),
-            ('UART5SEL'  , (('UART' , 5 ),)),
-            ('UART4SEL'  , (('UART' , 4 ),)),
-            ('USART3SEL' , (('USART', 3 ),)),
-            ('USART2SEL' , (('USART', 2 ),)),
-        ),
-        Mapping({
-            'APB1_CK'  : '0b000',
-            'PLL2Q_CK' : '0b001',
-            'PLL3Q_CK' : '0b010',
-            'HSI_CK'   : '0b011',
-            'CSI_CK'   : '0b100',
-            'LSE_CK'   : '0b101',
-            0          : '0b110',
-        }),
-    ),
-    (
-        (
-            ('USART1SEL', (('USART', 1),)),
-        ),
-        Mapping({
-            'APB2_CK'  : '0b000',
-            'PLL2Q_CK' : '0b001',
-            'PLL3Q_CK' : '0b010',
-            'HSI_CK'   : '0b011',
-            'CSI_CK'   : '0b100',
-            'LSE_CK'   : '0b101',
-            0          : '0b110',
-        }),
-    ),
-)
-
-
-
-global ADC_UNITS
-ADC_UNITS = (1, 2)
-
-
-
-global ADC_CONNECTIVITY
-ADC_CONNECTIVITY = (
-    ('F11', (1,  ), 2 ),
-    ('F12', (1,  ), 6 ),
-    ('F13', (2,  ), 2 ),
-    ('F14', (2,  ), 6 ),
-    ('A0' , (1, 2), 0 ),
-    ('A1' , (1, 2), 1 ),
-    ('A6' , (1, 2), 3 ),
-    ('C4' , (1, 2), 4 ),
-    ('B1' , (1, 2), 5 ),
-    ('A7' , (1, 2), 7 ),
-    ('C5' , (1, 2), 8 ),
-    ('B0' , (1, 2), 9 ),
-    ('C0' , (1, 2), 10),
-    ('C1' , (1, 2), 11),
-    ('C2' , (1, 2), 12),
-    ('C3' , (1, 2), 13),
-    ('A2' , (1, 2), 14),
-    ('A3' , (1, 2), 15),
-    ('A4' , (1, 2), 18),
-    ('A5' , (1, 2), 19),
-)
-
-
-
-global SCHEMA
-SCHEMA = {
-
-
-
-    ################################################################################
-    #
-    # Interrupts.
-    #
-
-
-
-    'BUS_FAULT_ENABLE' : {
-        'location' : ('SCB', 'SHCSR', 'BUSFAULTENA'),
-    },
-
-    'MEMORY_MANAGEMENT_FAULT_ENABLE' : {
-        'location' : ('SCB', 'SHCSR', 'MEMFAULTENA'),
-    },
-
-    'USAGE_FAULT_ENABLE' : {
-        'location' : ('SCB', 'SHCSR', 'USGFAULTENA'),
-    },
-
-
-
-    ################################################################################
-    #
-    # SysTick.
-    #
-
-
-
-    'SYSTICK_COUNTER' : {
-        'location' : ('SysTick', 'VAL', 'CURRENT'),
-    },
-
-    'SYSTICK_USE_CPU_CK' : {
-        'location'   : ('SysTick', 'CTRL', 'CLKSOURCE'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    'SYSTICK_INTERRUPT_ENABLE' : {
-        'location'   : ('SysTick', 'CTRL', 'TICKINT'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    'SYSTICK_ENABLE' : {
-        'location'   : ('SysTick', 'CTRL', 'ENABLE'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-
-
-    ################################################################################
-    #
-    # GPIOs.
-    #
-
-
-
-    **{
-        f'GPIO{port}_ENABLE' : {
-            'location'   : ('RCC', 'AHB2ENR', f'GPIO{port}EN'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for port, numbers in GPIOS
-    },
-
-    **{
-        f'GPIO{port}{number}_OPEN_DRAIN' : {
-            'location'   : (f'GPIO{port}', 'OTYPER', f'OT{number}'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for port, numbers in GPIOS
-        for number in numbers
-    },
-
-    **{
-        f'GPIO{port}{number}_OUTPUT' : {
-            'location'   : (f'GPIO{port}', 'ODR', f'OD{number}'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for port, numbers in GPIOS
-        for number in numbers
-    },
-
-    **{
-        f'GPIO{port}{number}_SPEED' : {
-            'location'   : (f'GPIO{port}', 'OSPEEDR', f'OSPEED{number}'),
-            'constraint' : Mapping({
-                'LOW'       : '0b00',
-                'MEDIUM'    : '0b01',
-                'HIGH'      : '0b10',
-                'VERY_HIGH' : '0b11',
-            }),
-            'value' : TBD,
-        }
-        for port, numbers in GPIOS
-        for number in numbers
-    },
-
-    **{
-        f'GPIO{port}{number}_PULL' : {
-            'location'   : (f'GPIO{port}', 'PUPDR', f'PUPD{number}'),
-            'constraint' : Mapping({
-                None   : '0b00',
-                'UP'   : '0b01',
-                'DOWN' : '0b10',
-            }),
-            'value' : TBD,
-        }
-        for port, numbers in GPIOS
-        for number in numbers
-    },
-
-    **{
-        f'GPIO{port}{number}_ALTERNATE_FUNCTION' : {
-            'location' : (f'GPIO_AFR{('L', 'H')[number // 8]}', f'GPIO{port}->AFR[{number // 8}]', f'AFSEL{number}'),
-            'value'    : TBD,
-        }
-        for port, numbers in GPIOS
-        for number in numbers
-    },
-
-    **{
-        f'GPIO{port}{number}_MODE' : {
-            'location'   : (f'GPIO{port}', 'MODER', f'MODE{number}'),
-            'constraint' : Mapping({
-                'INPUT'     : '0b00',
-                'OUTPUT'    : '0b01',
-                'ALTERNATE' : '0b10',
-                'ANALOG'    : '0b11',
-            }),
-            'value' : TBD,
-        }
-        for port, numbers in GPIOS
-        for number in numbers
-    },
-
-
-
-    ################################################################################
-    #
-    # Power.
-    #
-
-
-
-    'FLASH_PROGRAMMING_DELAY' : {
-        'location'   : ('FLASH', 'ACR', 'WRHIGHFREQ'),
-        'constraint' : Choices('0b00', '0b01', '0b10'),
-        'value'      : TBD,
-    },
-
-    'FLASH_LATENCY' : {
-        'location'   : ('FLASH', 'ACR', 'LATENCY'),
-        'constraint' : IntMinMax(0b0000, 0b1111),
-        'value'      : TBD,
-    },
-
-    'INTERNAL_VOLTAGE_SCALING' : {
-        'location'   : ('PWR', 'VOSCR', 'VOS'),
-        'constraint' : Mapping({
-            'VOS3': '0b00',
-            'VOS2': '0b01',
-            'VOS1': '0b10',
-            'VOS0': '0b11'
-        }),
-        'value' : TBD,
-    },
-
-    'CURRENT_ACTIVE_VOS' : {
-        'location' : ('PWR', 'VOSSR', 'ACTVOS'),
-    },
-
-    'CURRENT_ACTIVE_VOS_READY' : {
-        'location' : ('PWR', 'VOSSR', 'ACTVOSRDY'),
-    },
-
-    'LDO_ENABLE' : {
-        'location'   : ('PWR', 'SCCR', 'LDOEN'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    'POWER_MANAGEMENT_BYPASS' : {
-        'location'   : ('PWR', 'SCCR', 'BYPASS'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-
-
-    ################################################################################
-    #
-    # Clock Sources.
-    #
-
-
-
-    0 : {
-        'clocktree' : True,
-        'value'     : 0,
-    },
-
-    **{
-        key : {
-            'clocktree' : True,
-            'value'     : TBD,
-        }
-        for key in (
-            'CPU_CK',
-            'HSI_CK',
-            'HSI48_CK',
-            'CSI_CK',
-            'HSE_CK',
-            'LSE_CK',
-            'PER_CK',
-            'AXI_AHB_CK',
-            'SYSTICK_CK',
-        )
-    },
-
-    **{
-        f'{source}_ENABLE' : {
-            'location'   : ('RCC', 'CR', f'{source}ON'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for source in (
-            'HSI',
-            'HSI48',
-            'CSI',
-        )
-    },
-
-    **{
-        f'{source}_READY' : {
-            'location' : ('RCC', 'CR', f'{source}RDY'),
-        }
-        for source in (
-            'HSI',
-            'HSI48',
-            'CSI',
-        )
-    },
-
-    'PERIPHERAL_CLOCK_OPTION' : {
-        'location'   : ('RCC', 'CCIPR5', 'CKPERSEL'),
-        'constraint' : Mapping({
-            'HSI_CK' : '0b00',
-            'CSI_CK' : '0b01',
-            'HSE_CK' : '0b10',
-            0        : '0b11'
-        }),
-        'value' : TBD,
-    },
-
-
-
-    ################################################################################
-    #
-    # PLLs.
-    #
-
-
-
-    **{
-        f'PLL{unit}{channel}_CK' : {
-            'clocktree' : True,
-            'value'     : TBD,
-        }
-        for unit, channels in PLLS
-        for channel in channels
-    },
-
-    **{
-        f'PLL{unit}_VCO_FREQ' : {
-            'clocktree'  : True,
-            'constraint' : RealMinMax(128_000_000, 560_000_000),
-            'value'      : TBD,
-        }
-        for unit, channels in PLLS
-    },
-
-    **{
-        f'PLL{unit}_ENABLE' : {
-            'location'   : ('RCC', 'CR', f'PLL{unit}ON'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for unit, channels in PLLS
-    },
-
-    **{
-        f'PLL{unit}{channel}_ENABLE' : {
-            'location'   : ('RCC', f'PLL{unit}CFGR', f'PLL{unit}{channel}EN'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for unit, channels in PLLS
-        for channel in channels
-    },
-
-    **{
-        f'PLL{unit}_READY' : {
-            'location' : ('RCC', 'CR', f'PLL{unit}RDY'),
-        }
-        for unit, channels in PLLS
-    },
-
-    **{
-        f'PLL{unit}_KERNEL_SOURCE' : {
-            'location'   : ('RCC', f'PLL{unit}CFGR', f'PLL{unit}SRC'),
-            'constraint' : Mapping({
-                0        : '0b00',
-                'HSI_CK' : '0b01',
-                'CSI_CK' : '0b10',
-                'HSE_CK' : '0b11',
-            }),
-            'value' : TBD,
-        }
-        for unit, channels in PLLS
-    },
-
-    **{
-        f'PLL{unit}_INPUT_RANGE' : {
-            'location'   : ('RCC', f'PLL{unit}CFGR', f'PLL{unit}RGE'),
-            'constraint' : Mapping({
-                (2_000_000,  4_000_000) : 1,
-                (4_000_000,  8_000_000) : 2,
-                (8_000_000, 16_000_000) : 3,
-            }),
-            'value' : TBD,
-        }
-        for unit, channels in PLLS
-    },
-
-    **{
-        f'PLL{unit}_PREDIVIDER' : {
-            'location'   : ('RCC', f'PLL{unit}CFGR', f'PLL{unit}M'),
-            'constraint' : IntMinMax(1, 63),
-            'value'      : TBD,
-        }
-        for unit, channels in PLLS
-    },
-
-    **{
-        f'PLL{unit}_MULTIPLIER' : {
-            'location'   : ('RCC', f'PLL{unit}DIVR', f'PLL{unit}N'),
-            'constraint' : IntMinMax(4, 512),
-            'value'      : TBD,
-            'off_by_one' : True,
-        }
-        for unit, channels in PLLS
-    },
-
-    **{
-        f'PLL{unit}{channel}_DIVIDER' : {
-            'location'   : ('RCC', f'PLL{unit}DIVR', f'PLL{unit}{channel}'),
-            'constraint' : IntMinMax(1, 128),
-            'value'      : TBD,
-            'off_by_one' : True,
-        }
-        for unit, channels in PLLS
-        for channel in channels
-    },
-
-
-
-    ################################################################################
-    #
-    # System Clock Generation Unit.
-    #
-
-
-
-    **{
-        f'APB{unit}_CK' : {
-            'clocktree' : True,
-            'value'     : TBD,
-        }
-        for unit in APBS
-    },
-
-    'SYS_CK' : {
-        'clocktree' : True,
-        'value'     : TBD,
-    },
-
-    'EFFECTIVE_SCGU_KERNEL_SOURCE' : {
-        'location' : ('RCC', 'CFGR1', 'SWS'),
-    },
-
-    'SCGU_KERNEL_SOURCE' : {
-        'location'   : ('RCC', 'CFGR1', 'SW'),
-        'constraint' : Mapping({
-            'HSI_CK'   : '0b000',
-            'CSI_CK'   : '0b001',
-            'HSE_CK'   : '0b010',
-            'PLL1P_CK' : '0b011'
-        }),
-        'value' : TBD,
-    },
-
-    **{
-        f'APB{unit}_DIVIDER' : {
-            'location'   : ('RCC', 'CFGR2', f'PPRE{unit}'),
-            'constraint' : Mapping({
-                1  : '0b000',
-                2  : '0b100',
-                4  : '0b101',
-                8  : '0b110',
-                16 : '0b111',
-            }),
-            'value' : TBD,
-        }
-        for unit in APBS
-    },
-
-    'CPU_DIVIDER' : {
-        'location'   : ('RCC', 'CFGR2', 'HPRE'),
-        'constraint' : Mapping({
-            1   : '0b0000', # Low three bits are don't-care.
-            2   : '0b1000',
-            4   : '0b1001',
-            8   : '0b1010',
-            16  : '0b1011',
-            64  : '0b1100',
-            128 : '0b1101',
-            256 : '0b1110',
-            512 : '0b1111',
-        }),
-        'value' : TBD,
-    },
-
-
-
-    ################################################################################
-    #
-    # UXARTs.
-    #
-
-
-    **{
-        f'{peripheral}{unit}_BAUD' : {
-            'value' : TBD,
-        }
-        for instances in UXARTS
-        for peripheral, unit in instances
-    },
-
-    'USART1_ENABLE' : { 'location' : ('RCC', 'APB2ENR'  , 'USART1EN' ) },
-    'USART2_ENABLE' : { 'location' : ('RCC', 'APB1LENR' , 'USART2EN' ) },
-    'USART3_ENABLE' : { 'location' : ('RCC', 'APB1LENR' , 'USART3EN' ) },
-    'UART4_ENABLE'  : { 'location' : ('RCC', 'APB1LENR' , 'UART4EN'  ) },
-    'UART5_ENABLE'  : { 'location' : ('RCC', 'APB1LENR' , 'UART5EN'  ) },
-    'USART6_ENABLE' : { 'location' : ('RCC', 'APB1LENR' , 'USART6EN' ) },
-
-    'USART1_RESET'  : { 'location' : ('RCC', 'APB2RSTR' , 'USART1RST') },
-    'USART2_RESET'  : { 'location' : ('RCC', 'APB1LRSTR', 'USART2RST') },
-    'USART3_RESET'  : { 'location' : ('RCC', 'APB1LRSTR', 'USART3RST') },
-    'UART4_RESET'   : { 'location' : ('RCC', 'APB1LRSTR', 'UART4RST' ) },
-    'UART5_RESET'   : { 'location' : ('RCC', 'APB1LRSTR', 'UART5RST' ) },
-    'USART6_RESET'  : { 'location' : ('RCC', 'APB1LRSTR', 'USART6RST') },
-
-    'TIM1_RESET'    : { 'location' : ('RCC', 'APB2RSTR', 'TIM1RST' ) },
-    'TIM8_RESET'    : { 'location' : ('RCC', 'APB2RSTR', 'TIM8RST' ) },
-    'TIM15_RESET'   : { 'location' : ('RCC', 'APB2RSTR', 'TIM15RST') },
-    'TIM16_RESET'   : { 'location' : ('RCC', 'APB2RSTR', 'TIM16RST') },
-
-    **{
-        f'UXART_{instances}_KERNEL_SOURCE' : {
-            'location'   : ('RCC', 'CCIPR1', field),
-            'constraint' : kernel_source,
-            'value'      : TBD,
-            'pseudokeys' : [
-                f'{peripheral}{unit}_KERNEL_SOURCE'
-                for peripheral, unit in instances
-            ],
-        }
-        for field_instances, kernel_source in UXART_KERNEL_SOURCE_TABLE
-        for field, instances in field_instances
-    },
-
-    **{
-        f'{peripheral}{unit}_BAUD_DIVIDER' : {
-            'location'   : ('USART', 'BRR', 'BRR'),
-            'constraint' : IntMinMax(1, 1 << 16),
-            'value'      : TBD,
-        }
-        for instances in UXARTS
-        for peripheral, unit in instances
-    },
-
-
-
-    ################################################################################
-    #
-    # I2Cs.
-    #
-
-
-
-    **{
-        f'I2C{unit}_BAUD' : {
-            'value' : TBD,
-        }
-        for unit in I2CS
-    },
-
-    **{
-        f'I2C{unit}_KERNEL_SOURCE' : {
-            'location'   : ('RCC', 'CCIPR4', f'I2C{unit}SEL'),
-            'constraint' : constraint,
-            'value'      : TBD,
-        }
-        for units, constraint in(
-            ((1, 2), Mapping({
-                'APB1_CK'  : '0b00',
-                'PLL3R_CK' : '0b01',
-                'HSI_CK'   : '0b10',
-                'CSI_CK'   : '0b11'
-            })),
-            ((3,), Mapping({
-                'APB3_CK'  : '0b00',
-                'PLL3R_CK' : '0b01',
-                'HSI_CK'   : '0b10',
-                'CSI_CK'   : '0b11',
-            })),
-        )
-        for unit in units
-    },
-
-    'I2C1_RESET' : {
-        'location' : ('RCC', 'APB1LRSTR', f'I2C1RST'),
-    },
-
-    'I2C2_RESET' : {
-        'location' : ('RCC', 'APB1LRSTR', f'I2C2RST'),
-    },
-
-    'I2C3_RESET' : {
-        'location' : ('RCC', 'APB3RSTR', f'I2C3RST'),
-    },
-
-    'I2C1_ENABLE' : {
-        'location'   : ('RCC', 'APB1LENR', 'I2C1EN'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    'I2C2_ENABLE' : {
-        'location'   : ('RCC', 'APB1LENR', 'I2C2EN'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    'I2C3_ENABLE' : {
-        'location'   : ('RCC', 'APB3ENR', 'I2C3EN'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    **{
-        f'I2C{unit}_PRESC' : {
-            'location'   : ('I2C', 'TIMINGR', 'PRESC'),
-            'constraint' : IntMinMax(0, 15),
-            'value'      : TBD,
-        }
-        for unit in I2CS
-    },
-
-    **{
-        f'I2C{unit}_SCLH' : {
-            'location'   : ('I2C', 'TIMINGR', 'SCLH'),
-            'constraint' : IntMinMax(0, 255),
-            'value'      : TBD,
-        }
-        for unit in I2CS
-    },
-
-    **{
-        f'I2C{unit}_SCLL' : {
-            'location'   : ('I2C', 'TIMINGR', 'SCLL'),
-            'constraint' : IntMinMax(0, 255),
-            'value'      : TBD,
-        }
-        for unit in I2CS
-    },
-
-    **{
-        f'I2C{unit}_TIMEOUT' : {
-            'value' : TBD,
-        }
-        for unit in I2CS
-    },
-
-    **{
-        f'I2C{unit}_TIMEOUTR_TIMEOUTA' : {
-            'location'   : ('I2C', 'TIMEOUTR', 'TIMEOUTA'),
-            'constraint' : IntMinMax(0, (1 << 12) - 1),
-            'value'      : TBD,
-        }
-        for unit in I2CS
-    },
-
-
-
-    ################################################################################
-    #
-    # Timers.
-    #
-
-
-
-    'GLOBAL_TIMER_PRESCALER' : {
-        'location'   : ('RCC', 'CFGR1', 'TIMPRE'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    **{
-        f'TIM{unit}_COUNTER_RATE' : {
-            'value' : TBD,
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_UPDATE_RATE' : {
-            'value' : TBD,
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_MAX_UPDATE_RATE_ERROR' : {
-            'value'      : TBD,
-            'constraint' : RealMinMax(0, 1),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_ENABLE' : {
-            'location' : (
-                'RCC',
-                { # TODO Remove redundancy.
-                    'TIM1'  : 'APB2ENR' ,
-                    'TIM2'  : 'APB1LENR',
-                    'TIM3'  : 'APB1LENR',
-                    'TIM4'  : 'APB1LENR',
-                    'TIM5'  : 'APB1LENR',
-                    'TIM6'  : 'APB1LENR',
-                    'TIM7'  : 'APB1LENR',
-                    'TIM8'  : 'APB2ENR' ,
-                    'TIM12' : 'APB1LENR',
-                    'TIM15' : 'APB2ENR' ,
-                }[f'TIM{unit}'],
-                f'TIM{unit}EN'
-            ),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_COUNTER_ENABLE' : {
-            'location' : (f'TIM{unit}', 'CR1', 'CEN'),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_DIVIDER' : {
-            'location'   : (f'TIM{unit}', 'PSC', 'PSC'),
-            'constraint' : IntMinMax(1, 1 << 16),
-            'value'      : TBD,
-            'off_by_one' : True,
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_MODULATION' : {
-            'location'   : (f'TIM{unit}', 'PSC', 'ARR'),
-            'constraint' : IntMinMax(1, 1 << (32 if unit in (2, 5) else 16)),
-            'value'      : TBD,
-            'off_by_one' : True,
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_COUNTER' : {
-            'location' : (f'TIM{unit}', 'CNT', 'CNT'),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_FORCE_UPDATE' : {
-            'location' : (f'TIM{unit}', 'EGR', 'UG'),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_COUNTER_WIDTH' : {
-            'value' : 32 if unit in (2, 5) else 16,
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_CAPTURE_COMPARE_ENABLE_1' : {
-            'location' : (f'TIM{unit}', 'CCER', 'CC1E'),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_CAPTURE_COMPARE_ENABLE_2' : {
-            'location' : (f'TIM{unit}', 'CCER', 'CC2E'),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_CAPTURE_COMPARE_VALUE_1' : {
-            'location' : (f'TIM{unit}', 'CCR1', 'CCR1'),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_CAPTURE_COMPARE_VALUE_2' : {
-            'location' : (f'TIM{unit}', 'CCR2', 'CCR2'),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_CAPTURE_COMPARE_MODE_1' : {
-            'location' : (f'TIM{unit}', 'CCMR1', 'OC1M'),
-        }
-        for unit in TIMERS
-    },
-
-    **{
-        f'TIM{unit}_CAPTURE_COMPARE_MODE_2' : {
-            'location' : (f'TIM{unit}', 'CCMR1', 'OC2M'),
-        }
-        for unit in TIMERS
-    },
-
-
-
-    ################################################################################
-    #
-    # SPIs.
-    #
-
-
-
-    **{
-        f'SPI{unit}_BAUD' : {
-            'value' : TBD,
-        }
-        for unit in SPIS
-    },
-
-    **{
-        f'SPI{unit}_ENABLE' : {
-            'location' : (
-                'RCC',
-                { # TODO Less redundancy.
-                    1 : 'APB2ENR',
-                    2 : 'APB1LENR',
-                    3 : 'APB1LENR',
-                    4 : 'APB2ENR',
-                }[unit],
-                f'SPI{unit}EN'
-            ),
-        }
-        for unit in SPIS
-    },
-
-    **{
-        f'SPI{unit}_RESET' : {
-            'location' : (
-                'RCC',
-                { # TODO Less redundancy.
-                    1 : 'APB2RSTR',
-                    2 : 'APB1LRSTR',
-                    3 : 'APB1LRSTR',
-                    4 : 'APB2RSTR',
-                }[unit],
-                f'SPI{unit}RST'
-            ),
-        }
-        for unit in SPIS
-    },
-
-    **{
-        f'SPI{unit}_KERNEL_SOURCE' : {
-            'location'   : ('RCC', 'CCIPR3', f'SPI{unit}SEL'),
-            'constraint' : kernel_source,
-            'value'      : TBD,
-        }
-        for units, kernel_source in (
-            ((1, 2, 3), Mapping({
-                'PLL1Q_CK' : '0b000',
-                'PLL2P_CK' : '0b001',
-                'PLL3P_CK' : '0b010',
-                0          : '0b011', # TODO: 'AUDIOCLK'.
-                'PER_CK'   : '0b100',
-                0          : '0b101',
-            })),
-            ((4,), Mapping({
-                'APB2_CK'  : '0b000',
-                'PLL2Q_CK' : '0b001',
-                'PLL3Q_CK' : '0b010',
-                'HSI_CK'   : '0b011',
-                'CSI_CK'   : '0b100',
-                'HSE_CK'   : '0b101',
-                0          : '0b110',
-            })),
-        )
-        for unit in units
-    },
-
-    **{
-        f'SPI{unit}_BYPASS_DIVIDER' : {
-            'location'   : (f'SPI{unit}', 'CFG1', 'BPASS'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for unit in SPIS
-    },
-
-    **{
-        f'SPI{unit}_DIVIDER' : {
-            'location'   : (f'SPI{unit}', 'CFG1', 'MBR'),
-            'constraint' : Mapping({
-                2   : '0b000',
-                4   : '0b001',
-                8   : '0b010',
-                16  : '0b011',
-                32  : '0b100',
-                64  : '0b101',
-                128 : '0b110',
-                256 : '0b111',
-            }),
-            'value' : TBD,
-        }
-        for unit in SPIS
-    },
-
-
-
-    ################################################################################
-    #
-    # SDMMCs.
-    # TODO Remove duplication.
-    #
-
-
-
-    **{
-        f'SDMMC{unit}_INITIAL_BAUD' : {
-            'value' : TBD,
-        }
-        for unit in SDMMCS
-    },
-
-    **{
-        f'SDMMC{unit}_FULL_BAUD' : {
-            'value' : TBD,
-        }
-        for unit in SDMMCS
-    },
-
-    **{
-        f'SDMMC{unit}_TIMEOUT' : {
-            'value' : TBD,
-        }
-        for unit in SDMMCS
-    },
-
-    'SDMMC1_ENABLE' : {
-        'location' : ('RCC', 'AHB4ENR', 'SDMMC1EN'),
-    },
-
-    'SDMMC1_RESET' : {
-        'location' : ('RCC', 'AHB4RSTR', 'SDMMC1RST'),
-    },
-
-    'SDMMC1_KERNEL_SOURCE' : {
-        'location'   : ('RCC', 'CCIPR4', 'SDMMC1SEL'),
-        'constraint' : Mapping({
-            'PLL1Q_CK' : '0b0',
-            'PLL2R_CK' : '0b1',
-        }),
-        'value' : TBD,
-    },
-
-    'SDMMC1_INITIAL_DIVIDER' : {
-        'location'   : ('SDMMC1', 'CLKCR', 'CLKDIV'),
-        'constraint' : Mapping({
-            1 : '0x000',
-            **{
-                i * 2 : f'0x{i :03x}'
-                for i in range(0x001, 0x3FF+1)
-            }
-        }),
-        'value' : TBD,
-    },
-
-    'SDMMC1_FULL_DIVIDER' : {
-        'location'   : ('SDMMC1', 'CLKCR', 'CLKDIV'),
-        'constraint' : Mapping({
-            1 : '0x000',
-            **{
-                i * 2 : f'0x{i :03x}'
-                for i in range(0x001, 0x3FF+1)
-            }
-        }),
-        'value' : TBD,
-    },
-
-    'SDMMC1_INITIAL_DATATIME' : {
-        'location'   : ('SDMMC1', 'DTIMER', 'DATATIME'),
-        'constraint' : IntMinMax(0, (1 << 32) - 1),
-        'value'      : TBD,
-    },
-
-    'SDMMC1_FULL_DATATIME' : {
-        'location'   : ('SDMMC1', 'DTIMER', 'DATATIME'),
-        'constraint' : IntMinMax(0, (1 << 32) - 1),
-        'value'      : TBD,
-    },
-
-    'SDMMC_WAITRESP' : {
-        'value' : {
-            None  : '0b00', # No response packet will be sent back.
-            'r1'  : '0b01', # For 48-bit response packets.
-            'r1b' : '0b01', # "
-            'r6'  : '0b01', # "
-            'r7'  : '0b01', # "
-            'r3'  : '0b10', # For 48-bit response packets with no CRC.
-            'r2'  : '0b11', # For 136-bit response packets.
-        },
-    },
-
-
-
-    ################################################################################
-    #
-    # EXTI.
-    #
-
-
-
-    **{
-        f'EXTI{n}_{edge}_TRIGGER_SELECTION' : {
-            'location'   : ('EXTI', f'{edge[0]}TSR1', f'{edge[0]}T{n}'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for edge in ('RISING', 'FALLING')
-        for n in range(GPIO_MAX_PIN_NUMBER)
-    },
-
-    **{
-        f'EXTI{n}_INTERRUPT_ENABLE' : {
-            'location'   : ('EXTI', f'IMR{n}', f'IM{n}'),
-            'constraint' : Choices(False, True),
-            'value'      : TBD,
-        }
-        for edge in ('RISING', 'FALLING')
-        for n in range(GPIO_MAX_PIN_NUMBER)
-    },
-
-    **{
-        f'EXTI{n}_PORT_SELECTION' : {
-            'location'   : (f'EXTI_EXTICR{n // 4 + 1}', f'EXTI->EXTICR[{n // 4}]', f'EXTI{n}'),
-            'constraint' : Mapping({
-                port : f'0x{port_i :02X}'
-                for port_i, port in enumerate('ABCDEFGH')
-            }),
-            'value' : TBD,
-        }
-        for n in range(GPIO_MAX_PIN_NUMBER)
-    },
-
-    **{
-        f'EXTI{n}_PENDING_{edge}_INTERRUPT' : {
-            'location' : ('EXTI', f'{edge[0]}PR1', f'{edge[0]}PIF{n}'),
-        }
-        for edge in ('RISING', 'FALLING')
-        for n in range(GPIO_MAX_PIN_NUMBER)
-    },
-
-
-
-    ################################################################################
-    #
-    # Analog.
-    #
-
-
-
-    'ADC_PERIPHERAL_ENABLE' : {
-        'location'   : ('RCC', 'AHB2ENR', 'ADCEN'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_1_READY' : {
-        'location'   : ('ADC1', 'ISR', 'ADRDY'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_2_READY' : {
-        'location'   : ('ADC2', 'ISR', 'ADRDY'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_1_DEEP_POWER_DOWN' : {
-        'location'   : ('ADC1', 'CR', 'DEEPPWD'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_2_DEEP_POWER_DOWN' : {
-        'location'   : ('ADC2', 'CR', 'DEEPPWD'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_1_VOLTAGE_REGULATOR' : {
-        'location'   : ('ADC1', 'CR', 'ADVREGEN'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_2_VOLTAGE_REGULATOR' : {
-        'location'   : ('ADC2', 'CR', 'ADVREGEN'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_1_ENABLE' : {
-        'location'   : ('ADC1', 'CR', 'ADEN'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    'ADC_2_ENABLE' : {
-        'location'   : ('ADC2', 'CR', 'ADEN'),
-        'constraint' : Choices(False, True),
-        'value'      : TBD,
-    },
-
-    'ADC_1_CALIBRATION' : {
-        'location'   : ('ADC1', 'CR', 'ADCAL'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_2_CALIBRATION' : {
-        'location'   : ('ADC2', 'CR', 'ADCAL'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_1_OPTION_BIT' : {
-        'location'   : ('ADC1', 'OR', 'OP0'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ADC_2_OPTION_BIT' : {
-        'location'   : ('ADC1', 'OR', 'OP0'),
-        'constraint' : Choices(False, True),
-    },
-
-    'ANALOG_PREDIVIDER_KERNEL_CK' : {
-        'clocktree'  : True,
-        'value'      : TBD,
-        'constraint' : RealMinMax(0, 100_000_000), # TODO For simplicitly.
-    },
-
-    'ANALOG_POSTDIVIDER_KERNEL_CK' : {
-        'clocktree'  : True,
-        'value'      : TBD,
-        'constraint' : RealMinMax(0, 50_000_000), # TODO For simplicitly.
-    },
-
-    'ANALOG_KERNEL_SOURCE' : {
-        'location'   : ('RCC', 'CCIPR5', 'ADCDACSEL'),
-        'constraint' : Mapping({
-            'CPU_CK'   : '0b000',
-            'SYS_CK'   : '0b001',
-            'PLL2R_CK' : '0b010',
-            'HSE_CK'   : '0b011',
-            'HSI_CK'   : '0b100',
-            'CSI_CK'   : '0b101',
-        }),
-        'value' : TBD,
-    },
-
-    'ADC_KERNEL_DIVIDER' : {
-        'location'   : ('ADC12_COMMON', 'CCR', 'PRESC'),
-        'constraint' : Mapping({
-            1   : '0b0000',
-            2   : '0b0001',
-            4   : '0b0010',
-            6   : '0b0011',
-            8   : '0b0100',
-            10  : '0b0101',
-            12  : '0b0110',
-            16  : '0b0111',
-            32  : '0b1000',
-            64  : '0b1001',
-            128 : '0b1010',
-            256 : '0b1011',
-        }),
-        'value' : TBD,
-    },
-
-
-
-    ################################################################################
-    #
-    # Independent Watchdog.
-    #
-
-
-
-    'WATCHDOG_DURATION' : {
-        'value' : TBD,
-    },
-
-    'WATCHDOG_KEY' : {
-        'location' : ('IWDG', 'KR', 'KEY'),
-    },
-
-    'WATCHDOG_DIVIDER' : {
-        'location'   : ('IWDG', 'PR', 'PR'),
-        'constraint' : Mapping({
-            4    : '0b0000',
-            8    : '0b0001',
-            16   : '0b0010',
-            32   : '0b0011',
-            64   : '0b0100',
-            128  : '0b0101',
-            256  : '0b0110',
-            512  : '0b0111',
-            1024 : '0b1000',
-        }),
-        'value' : TBD,
-    },
-
-    'WATCHDOG_COUNTER_RELOADING_VALUE' : {
-        'location'   : ('IWDG', 'RLR', 'RL'),
-        'constraint' : IntMinMax(2, (1 << 11) - 1),
-        'value'      : TBD,
-    },
-
-    'WATCHDOG_DIVIDER_UPDATED'                 : { 'location' : ('IWDG'  , 'SR'      , 'PVU'          ), },
-    'WATCHDOG_COUNTER_RELOADING_VALUE_UPDATED' : { 'location' : ('IWDG'  , 'SR'      , 'RVU'          ), },
-    'WATCHDOG_STOP_IN_DEBUG'                   : { 'location' : ('DBGMCU', 'APB1FZR1', 'DBG_IWDG_STOP'), },
-
-
-
-    ################################################################################
-    #
-    # Misc.
-    #
-
-
-
-    'DEBUG_CYCLE_COUNT_ENABLE' : { 'location' : ('DWT', 'CTRL', 'CYCCNTENA') },
-
-
-
-}
+global PACKAGE_PIN_COUNT
+PACKAGE_PIN_COUNT = 64
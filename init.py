@@ -13,20 +13,41 @@ def init(
     schema,
     gpios,
     interrupts,
+    pll_engine       = 'scalar',
+    pll_cache        = True,
+    pll_cache_path   = None,
+    solver_workers   = None,
+    previous         = None,
+    lockfile         = None,
+    collect_stats    = False,
+    stats_path       = None,
+    parameterization = None,
 ):
 
 
 
     # Figure out how to configure the target's
-    # MCU based on the given parameterization.
-
-    parameterization = Parameterization(
-        target,
-        mcu,
-        schema,
-        gpios,
-        interrupts,
-    )
+    # MCU based on the given parameterization,
+    # unless it was already done ahead of time
+    # (e.g. with `parameterize_batch`).
+
+    if parameterization is None:
+
+        parameterization = Parameterization(
+            target,
+            mcu,
+            schema,
+            gpios,
+            interrupts,
+            pll_engine     = pll_engine,
+            pll_cache      = pll_cache,
+            pll_cache_path = pll_cache_path,
+            solver_workers = solver_workers,
+            previous       = previous,
+            lockfile       = lockfile,
+            collect_stats  = collect_stats,
+            stats_path     = stats_path,
+        )
 
 
 
@@ -36,7 +57,7 @@ def init(
     # on the code generation.
 
     if parameterization.schema is None:
-        return
+        return parameterization
 
 
 
@@ -97,17 +118,15 @@ def init(
         # slots in the interrupt vector table; everything
         # else will be to the default interrupt handler.
 
+        symbols = {
+            interrupt.name : interrupt.symbol
+            for interrupt in parameterization.interrupts
+        }
+
         for table_interrupt_i, table_interrupt in enumerate(MCUS[parameterization.mcu]['INTERRUPTS'].value):
 
             rows += [(
-                next(
-                    (
-                        target_interrupt.symbol
-                        for target_interrupt in parameterization.interrupts
-                        if target_interrupt.name == table_interrupt
-                    ),
-                    f'INTERRUPT_Default'
-                ),
+                symbols.get(table_interrupt, f'INTERRUPT_Default'),
                 table_interrupt_i - 15,
                 'Reserved' if table_interrupt is None else table_interrupt,
             )]
@@ -232,6 +251,15 @@ def init(
 
 
 
+    # The parameterization is given back so that it can be passed
+    # in as `previous` the next time around (e.g. a build that's
+    # watching for edits to the schema), in which case only the
+    # solvers that are affected by the edit are ran again.
+
+    return parameterization
+
+
+
 ################################################################################
 
 
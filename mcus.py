@@ -1,4 +1,4 @@
-import pathlib, types, csv, difflib
+import pathlib, types, csv, difflib, hashlib, pickle, io, os, collections, collections.abc, sqlite3, contextlib
 
 
 
@@ -28,6 +28,9 @@ class TBD:
     def __deepcopy__(self, memo):
         return self
 
+    def __reduce__(self):
+        return 'TBD' # So unpickling gives back the singleton.
+
 TBD = TBD()
 
 
@@ -133,6 +136,444 @@ class Mapping(Constraint):
 
 
 
+################################################################################
+#
+# A key can be resolved into a handle, which is just the position of the
+# entry in the MCU's database. It's its own type since some keys are
+# integers themselves (e.g. the `0` frequency).
+#
+
+
+
+class Handle(int):
+    __slots__ = ()
+
+
+
+################################################################################
+#
+# Each database entry of an MCU is a record of the properties below.
+# There are over a thousand of these per MCU and the parameterization
+# accesses them constantly, so the record is slotted to keep it small
+# and quick to read from.
+#
+# The `value` slot is left unset for entries that can't be associated
+# with a value at all, so `hasattr(entry, 'value')` can distinguish
+# them from entries that are just TBD.
+#
+
+
+
+class Entry:
+
+    __slots__ = (
+        'clocktree',
+        'location',
+        'off_by_one',
+        'constraint',
+        'value',
+    )
+
+    def __init__(self, *, clocktree, location, off_by_one):
+        self.clocktree  = clocktree
+        self.location   = location
+        self.off_by_one = off_by_one
+        self.constraint = None
+
+    def __repr__(self):
+        return f'Entry({', '.join(
+            f'{field}={repr(getattr(self, field))}'
+            for field in self.__slots__
+            if hasattr(self, field)
+        )})'
+
+
+
+# The handles of the entries that can hold a value, the ones that have
+# a predefined value, and the ones that are frequencies of the clock tree.
+# These are stored along with the compiled database so that opening it
+# doesn't involve decoding every single entry just to find these out.
+
+def summarize_entries(entries):
+
+    entries     = tuple(entries)
+    holds_value = tuple(hasattr(entry, 'value') for entry in entries)
+
+    return types.SimpleNamespace(
+        holds_value = holds_value,
+        predefined  = tuple(
+            handle
+            for handle, entry in enumerate(entries)
+            if holds_value[handle] and entry.value is not TBD
+        ),
+        clocktree = tuple(
+            handle
+            for handle, entry in enumerate(entries)
+            if entry.clocktree
+        ),
+    )
+
+
+
+# A table indexed by handle where each item is only
+# worked out when it's first looked up (e.g. decoding
+# the entry from the compiled database); afterwards,
+# it's just an ordinary dictionary lookup.
+
+class LazyTable(dict):
+
+    def __init__(self, function):
+        self.function = function
+
+    def __missing__(self, handle):
+        item = self[handle] = self.function(handle)
+        return item
+
+
+
+################################################################################
+#
+# When the user gives a key or name that doesn't exist, we want to
+# suggest the closest matches, but running `difflib` against every
+# single key of the database is slow when there's a lot of typos to
+# report. Instead, we index the words by their trigrams so we can
+# quickly narrow it down to a handful of candidates that share the
+# most trigrams with the misspelled word; `difflib` then only has to
+# rank those.
+#
+
+
+
+class CloseMatches:
+
+
+
+    def __init__(self, words):
+
+        self.words    = tuple(dict.fromkeys(map(str, words)))
+        self.sizes    = []
+        self.postings = collections.defaultdict(list)
+
+        for word_i, word in enumerate(self.words):
+
+            trigrams = self.trigrams(word)
+
+            self.sizes += [len(trigrams)]
+
+            for trigram in trigrams:
+                self.postings[trigram] += [word_i]
+
+
+
+    def trigrams(self, word):
+
+        word = f'  {word.upper()} '
+
+        return { word[i : i + 3] for i in range(len(word) - 2) }
+
+
+
+    def __call__(self, word, n, *, shortlist = 32):
+
+        word     = str(word)
+        trigrams = self.trigrams(word)
+
+
+
+        # Tally up the trigrams each candidate has in common with the word.
+
+        tallies = collections.Counter()
+
+        for trigram in trigrams:
+            tallies.update(self.postings.get(trigram, ()))
+
+
+
+        # If there's nothing in common at all,
+        # we'll just have to rank everything.
+
+        if not tallies:
+            return difflib.get_close_matches(word, self.words, n = n, cutoff = 0)
+
+
+
+        # Score the candidates by how similar their set of trigrams are
+        # (Sørensen–Dice); only the best ones, including any that are tied
+        # with the last one that made the cut, are then ranked by `difflib`.
+
+        scores = sorted(
+            (
+                (2 * tally / (len(trigrams) + self.sizes[word_i]), word_i)
+                for word_i, tally in tallies.items()
+            ),
+            reverse = True,
+        )
+
+        lowest_score, _ = scores[min(shortlist, len(scores)) - 1]
+
+        return difflib.get_close_matches(
+            word,
+            [
+                self.words[word_i]
+                for score, word_i in scores
+                if score >= lowest_score
+            ],
+            n      = n,
+            cutoff = 0,
+        )
+
+
+
+################################################################################
+#
+# MCUs of the same family (e.g. STM32H533RET6 and STM32H533VET6) mostly
+# differ only by their package, so the bulk of the database is described
+# once in a family database under `databases/families/`. The MCU's own
+# database script then calls `extend` to pull in everything from the
+# family database and overlays whatever is specific to the package.
+#
+# A family database is only ever executed once; afterwards, its globals
+# are shared by every MCU that extends it, so they must not be mutated.
+#
+
+
+
+DATABASE_BUILTINS = {
+    'TBD'        : TBD,
+    'RealMinMax' : RealMinMax,
+    'IntMinMax'  : IntMinMax,
+    'Choices'    : Choices,
+    'Mapping'    : Mapping,
+    'extend'     : None, # Provided by `execute_database`.
+}
+
+DATABASE_CONSTRAINTS = {
+    name : value
+    for name, value in DATABASE_BUILTINS.items()
+    if isinstance(value, type) and issubclass(value, Constraint)
+}
+
+FAMILIES = {}
+
+
+
+def execute_database(path):
+
+    database_globals = dict(DATABASE_BUILTINS)
+
+
+
+    def extend(family):
+
+        if family not in FAMILIES:
+            FAMILIES[family] = execute_database(
+                pathlib.Path(__file__)
+                    .parent
+                    .joinpath(f'databases/families/{family}.py')
+            )
+
+        database_globals.update({
+            key : value
+            for key, value in FAMILIES[family].items()
+            if key not in ('__builtins__', 'extend')
+        })
+
+
+
+        # The script might add or replace entries in
+        # the schema, so it'll need its own copy of it.
+
+        database_globals['SCHEMA'] = dict(FAMILIES[family]['SCHEMA'])
+
+
+
+    database_globals['extend'] = extend
+
+    exec(path.read_text(), database_globals, {})
+
+    return database_globals
+
+
+
+################################################################################
+#
+# The compiled database is pickled, but `TBD` and the constraints are stored
+# as plain data rather than by a reference to their class; the reference
+# would include the package path that this module was imported under
+# (e.g. `deps.stpy.mcus`), so importing it under another path would either
+# fail to unpickle or end up with a second `TBD` that `is TBD` wouldn't match.
+#
+
+
+
+class DatabasePickler(pickle.Pickler):
+
+    def persistent_id(self, value):
+
+        if value is TBD:
+            return 'TBD'
+
+        if isinstance(value, Constraint):
+            return (type(value).__name__, vars(value))
+
+        return None
+
+
+
+class DatabaseUnpickler(pickle.Unpickler):
+
+    def persistent_load(self, identifier):
+
+        if identifier == 'TBD':
+            return TBD
+
+        name, state = identifier
+        constraint  = object.__new__(DATABASE_CONSTRAINTS[name])
+
+        vars(constraint).update(state)
+
+        return constraint
+
+
+
+def encode_database_value(value):
+
+    buffer = io.BytesIO()
+
+    DatabasePickler(buffer, protocol = pickle.HIGHEST_PROTOCOL).dump(value)
+
+    return buffer.getvalue()
+
+
+
+def decode_database_value(blob):
+    return DatabaseUnpickler(io.BytesIO(blob)).load()
+
+
+
+################################################################################
+#
+# A compiled database is opened read-only and memory-mapped;
+# it acts like the `MCU.database` dictionary, but the entries
+# are only decoded from the file when they're first accessed.
+#
+
+
+
+class CompiledDatabase(collections.abc.Mapping):
+
+
+
+    def __init__(self, path):
+
+        self.path       = path
+        self.process_id = None
+        self.keys       = self.metadata('keys')
+        self.positions  = { key : position for position, key in enumerate(self.keys) }
+        self.entries    = [None] * len(self.keys)
+
+
+
+    # SQLite connections can't be carried over to a forked
+    # process, so each process opens up its own connection.
+
+    def connection(self):
+
+        if self.process_id != os.getpid():
+
+            self.process_id  = os.getpid()
+            self.connection_ = sqlite3.connect(
+                f'file:{self.path}?mode=ro',
+                uri                = True,
+                check_same_thread  = False,
+            )
+
+            self.connection_.execute('PRAGMA mmap_size = 268435456')
+
+        return self.connection_
+
+
+
+    def metadata(self, field):
+
+        row = self.connection().execute(
+            'SELECT value FROM metadata WHERE field = ?',
+            (field,)
+        ).fetchone()
+
+        if row is None:
+            raise KeyError(field)
+
+        value, = row
+
+        return decode_database_value(value)
+
+
+
+    def decode(self, clocktree, location, off_by_one, constraint, value):
+
+        entry = Entry(
+            clocktree  = bool(clocktree),
+            location   = decode_database_value(location),
+            off_by_one = decode_database_value(off_by_one),
+        )
+
+        entry.constraint = decode_database_value(constraint)
+
+        if value is not None:
+            entry.value = decode_database_value(value)
+
+        return entry
+
+
+
+    def __getitem__(self, key):
+
+        position = self.positions[key]
+
+        if self.entries[position] is None:
+            self.entries[position] = self.decode(*self.connection().execute(
+                'SELECT clocktree, location, off_by_one, rule, value FROM entries WHERE position = ?',
+                (position,)
+            ).fetchone())
+
+        return self.entries[position]
+
+
+
+    # When going through all of the entries anyways,
+    # it's much faster to decode them all in one go.
+
+    def items(self):
+
+        if None in self.entries:
+            for position, *row in self.connection().execute(
+                'SELECT position, clocktree, location, off_by_one, rule, value FROM entries'
+            ):
+                if self.entries[position] is None:
+                    self.entries[position] = self.decode(*row)
+
+        return super().items()
+
+    def values(self):
+
+        self.items()
+
+        return super().values()
+
+
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+
+
 ################################################################################
 
 
@@ -148,25 +589,191 @@ class MCU:
 
 
 
-        # Execute the database script.
+        # Indices for suggesting close matches are built on demand.
+
+        self.key_matches       = None
+        self.interrupt_matches = None
 
-        database_globals = {
-            'TBD'        : TBD,
-            'RealMinMax' : RealMinMax,
-            'IntMinMax'  : IntMinMax,
-            'Choices'    : Choices,
-            'Mapping'    : Mapping,
-        }
 
-        initial_globals = list(database_globals.keys())
 
-        exec(
+        # Executing the database script and parsing the CSV
+        # is a fixed cost that we'd have to pay on every run,
+        # so the result gets compiled into an indexed SQLite file;
+        # as long as the sources haven't changed since, we can just
+        # open that file and decode the entries as they're needed.
+
+        compiled_path = (
+            pathlib.Path(__file__)
+                .parent
+                .joinpath(f'databases/__pycache__/{self.name}.sqlite')
+        )
+
+
+
+        # If the compiled database can't be read for whatever
+        # reason (e.g. it's corrupted), it's the same as it being stale.
+
+        self.checksum = self.digest()
+
+        try:
+
+            compiled = CompiledDatabase(compiled_path)
+
+            if compiled.metadata('digest') == self.checksum:
+                self.database    = compiled
+                self.translation = compiled.metadata('translation')
+                self.pins        = compiled.metadata('pins'       )
+                self.summary     = compiled.metadata('summary'    )
+            else:
+                compiled = None
+
+        except (sqlite3.Error, OSError, EOFError, pickle.UnpicklingError, ImportError, AttributeError, KeyError):
+            compiled = None
+
+
+
+        # The compiled database is missing or stale,
+        # so build the MCU from scratch and recompile.
+        # If the location isn't writable, then oh well,
+        # we'll just have to rebuild again on the next run.
+
+        if compiled is None:
+
+            self.build()
+
+            try:
+                self.compile(compiled_path, self.checksum)
+            except (sqlite3.Error, OSError):
+                pass
+
+
+
+        # Lookups regarding pins and interrupts
+        # are done through precomputed indices.
+
+        self.index()
+
+
+
+    ################################################################################
+    #
+    # The compiled database is keyed by a hash of everything that goes into
+    # building the MCU: the database script, the pinout CSV, the family
+    # databases that the script might extend, and this very file
+    # (since it determines how the sources are processed).
+    #
+
+
+
+    def digest(self):
+
+        hasher = hashlib.sha256()
+
+        for path in (
+            pathlib.Path(__file__),
+            pathlib.Path(__file__).parent.joinpath(f'databases/{self.name}.py' ),
+            pathlib.Path(__file__).parent.joinpath(f'databases/{self.name}.csv'),
+            *sorted(pathlib.Path(__file__).parent.joinpath('databases/families').glob('*.py')),
+        ):
+            hasher.update(path.read_bytes())
+
+        return hasher.hexdigest()
+
+
+
+    ################################################################################
+    #
+    # The compiled database has the entries of the schema in a table
+    # indexed by the position of the entry in the schema; the other
+    # tables (translation of pseudokeys, pins and their alternate functions)
+    # are small enough that they're just stored as a whole.
+    #
+    # The file is written to a temporary location first
+    # so a concurrent run never sees a partial database.
+    #
+
+
+
+    def compile(self, path, digest):
+
+        encode = encode_database_value
+
+        path.parent.mkdir(parents = True, exist_ok = True)
+
+        temporary_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        temporary_path.unlink(missing_ok = True)
+
+        try:
+
+            with contextlib.closing(sqlite3.connect(temporary_path)) as connection:
+
+                connection.execute('''
+                    CREATE TABLE metadata (
+                        field TEXT PRIMARY KEY,
+                        value BLOB
+                    )
+                ''')
+
+                connection.execute('''
+                    CREATE TABLE entries (
+                        position   INTEGER PRIMARY KEY,
+                        clocktree  INTEGER,
+                        location   BLOB,
+                        off_by_one BLOB,
+                        rule       BLOB, -- The entry's constraint.
+                        value      BLOB  -- NULL if the entry can't hold a value.
+                    )
+                ''')
+
+                connection.executemany(
+                    'INSERT INTO metadata VALUES (?, ?)',
+                    (
+                        ('digest'     , encode(digest              )),
+                        ('keys'       , encode(tuple(self.database))),
+                        ('translation', encode(self.translation    )),
+                        ('pins'       , encode(self.pins           )),
+                        ('summary'    , encode(self.summary         )),
+                    )
+                )
+
+                connection.executemany(
+                    'INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                    (
+                        (
+                            position,
+                            entry.clocktree,
+                            encode(entry.location  ),
+                            encode(entry.off_by_one),
+                            encode(entry.constraint),
+                            encode(entry.value) if hasattr(entry, 'value') else None,
+                        )
+                        for position, entry in enumerate(self.database.values())
+                    )
+                )
+
+                connection.commit()
+
+            os.replace(temporary_path, path)
+
+        finally:
+            temporary_path.unlink(missing_ok = True)
+
+
+
+    ################################################################################
+
+
+
+    def build(self):
+
+
+
+        # Execute the database script.
+
+        database_globals = execute_database(
             pathlib.Path(__file__)
                 .parent
                 .joinpath(f'databases/{self.name}.py')
-                .read_text(),
-            database_globals,
-            {},
         )
 
 
@@ -175,7 +782,7 @@ class MCU:
 
         for key in database_globals.keys():
 
-            if key in ('__builtins__', 'SCHEMA', *initial_globals):
+            if key in ('__builtins__', 'SCHEMA', *DATABASE_BUILTINS):
                 continue
 
             database_globals['SCHEMA'][key] = {
@@ -191,7 +798,9 @@ class MCU:
 
         for proper_key, entry in database_globals['SCHEMA'].items():
 
-            self.database[proper_key] = types.SimpleNamespace(
+            entry = dict(entry) # The entry might be shared with other MCUs of the same family.
+
+            self.database[proper_key] = Entry(
                 clocktree  = entry.pop('clocktree' , False),
                 location   = entry.pop('location'  , None ),
                 off_by_one = entry.pop('off_by_one', None ),
@@ -250,8 +859,7 @@ class MCU:
         # working a particular MCU, we should have this file
         # generated already.
 
-        self.pinouts          = {}
-        self.gpio_afsel_table = {} # TODO Combine with `self.pinouts`.
+        self.pins = {}
 
         for entry in csv.DictReader(
             pathlib.Path(__file__)
@@ -263,9 +871,16 @@ class MCU:
 
 
 
-            pin_name = entry['Name']
+            pin = types.SimpleNamespace(
+                position            = entry['Position'],
+                type                = entry['Type'],
+                name                = entry['Name'],
+                port                = None,
+                number              = None,
+                alternate_functions = {},
+            )
 
-            match entry['Type']:
+            match pin.type:
 
 
 
@@ -286,13 +901,13 @@ class MCU:
                     # >     PC2_C                   -> PC2
                     # >
 
-                    pin_name = pin_name.split('-', 1)[0]
-                    pin_name = pin_name.split('(', 1)[0]
-                    pin_name = pin_name.split('_', 1)[0]
-                    port     = pin_name[1]
-                    number   = int(pin_name[2:])
+                    pin.name   = pin.name.split('-', 1)[0]
+                    pin.name   = pin.name.split('(', 1)[0]
+                    pin.name   = pin.name.split('_', 1)[0]
+                    pin.port   = pin.name[1]
+                    pin.number = int(pin.name[2:])
 
-                    assert pin_name.startswith('P') and ('A' <= port <= 'Z')
+                    assert pin.name.startswith('P') and ('A' <= pin.port <= 'Z')
 
 
 
@@ -314,11 +929,9 @@ class MCU:
 
                         for alternate_function in entry[f'AF{code}'].split('/'):
 
-                            key = (port, number, alternate_function)
-
-                            assert key not in self.gpio_afsel_table
+                            assert alternate_function not in pin.alternate_functions
 
-                            self.gpio_afsel_table[key] = code
+                            pin.alternate_functions[alternate_function] = code
 
 
 
@@ -345,18 +958,147 @@ class MCU:
 
 
 
-            assert entry['Position'] not in self.pinouts
-            self.pinouts[entry['Position']] = types.SimpleNamespace(
-                type = entry['Type'],
-                name = pin_name,
-            )
+            assert pin.position not in self.pins
+            self.pins[pin.position] = pin
+
+
+
+        # If the database specifies the package's pin count,
+        # we can make sure we got the right CSV for it.
+
+        if 'PACKAGE_PIN_COUNT' in self.database:
+
+            if len(self.pins) != self.database['PACKAGE_PIN_COUNT'].value:
+                raise ValueError(
+                    f'MCU {repr(self.name)} has a package of '
+                    f'{self.database['PACKAGE_PIN_COUNT'].value} pins, '
+                    f'but the CSV lists {len(self.pins)}.'
+                )
+
+
+
+        # Summarize the entries for indexing (see `summarize_entries`).
+
+        self.summary = summarize_entries(self.database.values())
+
+
+
+    ################################################################################
+    #
+    # The pins of the package are what's stored, but the parameterization
+    # will be wanting to look things up in all sorts of ways; e.g:
+    # >
+    # >    gpios                   : ('A', 2)     -> pin
+    # >    alternate_function_pins : 'USART2_TX'  -> (('A', 2), ('D', 5), ...)
+    # >    peripheral_pins         : 'USART2'     -> (('A', 2, 'USART2_TX'), ...)
+    # >    adc_channels            : ('A', 0)     -> ((1, 0), (2, 0))
+    # >    interrupt_numbers       : 'USART2'     -> 59
+    # >
+    # Note that the ADC connectivity is based on the MCU's die rather
+    # than the package, so there can be analog pins that the package
+    # might not actually have.
+    #
+
+
+
+    def index(self):
+
+
+
+        self.gpios                   = {}
+        self.alternate_function_pins = collections.defaultdict(list)
+        self.peripheral_pins         = collections.defaultdict(list)
+
+        for pin in self.pins.values():
+
+            if pin.port is None:
+                continue
+
+            self.gpios[(pin.port, pin.number)] = pin
+
+            for alternate_function in pin.alternate_functions:
+
+                peripheral, *_ = alternate_function.split('_', 1)
+
+                self.alternate_function_pins[alternate_function] += [(pin.port, pin.number)]
+                self.peripheral_pins        [peripheral        ] += [(pin.port, pin.number, alternate_function)]
+
+        self.alternate_function_pins = dict(self.alternate_function_pins)
+        self.peripheral_pins         = dict(self.peripheral_pins)
+
+
+
+        self.adc_channels = {}
+
+        if 'ADC_CONNECTIVITY' in self.database:
+
+            for pin, adc_units, channel in self.database['ADC_CONNECTIVITY'].value:
+
+                self.adc_channels[(pin[0], int(pin[1:]))] = tuple(
+                    (adc_unit, channel)
+                    for adc_unit in adc_units
+                )
+
+
+
+        self.interrupt_numbers = {}
+
+        if 'INTERRUPTS' in self.database:
+
+            for interrupt_i, interrupt in enumerate(self.database['INTERRUPTS'].value):
+
+                if interrupt is not None:
+                    self.interrupt_numbers[interrupt] = interrupt_i - 15 # Arm exceptions are negative.
+
+
+
+        # Every key (including pseudokeys) can be resolved once into
+        # an integer handle, which is just the position of the entry
+        # in the database; things that are looked up by handle are then
+        # just a matter of indexing into a table. The entries are only
+        # decoded from the compiled database as they're looked up.
+
+        self.keys    = tuple(self.database)
+        self.entries = LazyTable(lambda handle: self.database[self.keys[handle]])
+        positions    = { key : Handle(handle) for handle, key in enumerate(self.keys) }
+        self.handles = { given_key : positions[proper_key] for given_key, proper_key in self.translation.items() }
+
+        self.holds_value = self.summary.holds_value
+
+
+
+        # The default values of the entries that can hold a value
+        # (TBD for the ones that can't); the ones that are predefined
+        # can't ever be changed.
+
+        self.defaults = LazyTable(
+            lambda handle: self.entries[handle].value if self.holds_value[handle] else TBD
+        )
+
+        self.valued = tuple(
+            Handle(handle)
+            for handle, holds_value in enumerate(self.holds_value)
+            if holds_value
+        )
+
+        self.predefined = frozenset(map(Handle, self.summary.predefined))
+
+
+
+        # The entries that are frequencies of the clock tree.
+
+        self.clocktree = tuple(map(Handle, self.summary.clocktree))
+
+
+
+    ################################################################################
 
 
 
     def __getitem__(self, given_key):
 
-        return self.database[
-            self.translate(
+        return self.entries[
+            self.handle(
                 given_key,
                 must_hold_value = False,
                 undefined_ok    = False,
@@ -365,44 +1107,131 @@ class MCU:
 
 
 
-    def translate(self, given_key, *, must_hold_value, undefined_ok):
+    def close_keys(self, given_key, n):
 
-        proper_key = self.translation.get(given_key, None)
+        if self.key_matches is None:
+            self.key_matches = CloseMatches(self.translation.keys())
 
-        if proper_key is None:
+        return self.key_matches(given_key, n)
 
-            if undefined_ok:
-                return None
 
-            raise ValueError(
-                f'Undefined key {repr(given_key)} for database of MCU {repr(self.name)}; '
-                f'close matches: {
-                    repr(difflib.get_close_matches(
-                        str(given_key),
-                        map(str, self.translation.keys()),
-                        n      = 3,
-                        cutoff = 0,
-                    ))
-                }.'
+
+    def close_interrupts(self, name, n):
+
+        if self.interrupt_matches is None:
+            self.interrupt_matches = CloseMatches(
+                interrupt
+                for interrupt in self['INTERRUPTS'].value
+                if interrupt is not None
             )
 
-        if must_hold_value and not hasattr(self.database[proper_key], 'value'):
+        return self.interrupt_matches(name, n)
+
+
+
+    # A given key can be a handle that was already resolved,
+    # in which case only the check for holding a value is done.
+
+    def handle(self, given_key, *, must_hold_value, undefined_ok):
+
+        if given_key.__class__ is Handle:
+
+            handle = given_key
+
+        else:
+
+            handle = self.handles.get(given_key, None)
+
+            if handle is None:
+
+                if undefined_ok:
+                    return None
+
+                raise ValueError(
+                    f'Undefined key {repr(given_key)} for database of MCU {repr(self.name)}; '
+                    f'close matches: {repr(self.close_keys(given_key, 3))}.'
+                )
+
+        if must_hold_value and not self.holds_value[handle]:
             raise ValueError(
-                f'Key {repr(given_key)} for database of MCU {repr(self.name)} '
+                f'Key {repr(self.keys[handle] if given_key is handle else given_key)} for database of MCU {repr(self.name)} '
                 f'is not associated with or can hold a value.'
             )
 
-        return proper_key
+        return handle
 
 
 
-MCUS = {
-    mcu : MCU(mcu)
-    for mcu in sorted(dict.fromkeys(
-        item.stem
-        for item in pathlib.Path(__file__).parent.joinpath('databases').iterdir()
-        if item.is_file()
-        if item.stem.isidentifier()
-        if item.stem.startswith('STM32')
-    ))
-}
+    def translate(self, given_key, *, must_hold_value, undefined_ok):
+
+        handle = self.handle(
+            given_key,
+            must_hold_value = must_hold_value,
+            undefined_ok    = undefined_ok,
+        )
+
+        if handle is None:
+            return None
+
+        return self.keys[handle]
+
+
+
+################################################################################
+#
+# The registry of MCUs is a mapping of the MCU name to its `MCU` object.
+# Since a target only ever uses one MCU, we don't construct an `MCU` until
+# it's actually needed; the names of the available MCUs, however, can be
+# listed without loading anything since it's just a matter of looking at
+# what databases there are.
+#
+
+
+
+class MCUS(collections.abc.Mapping):
+
+
+
+    def __init__(self):
+
+        self.names = tuple(sorted(dict.fromkeys(
+            item.stem
+            for item in pathlib.Path(__file__).parent.joinpath('databases').iterdir()
+            if item.is_file()
+            if item.stem.isidentifier()
+            if item.stem.startswith('STM32')
+        )))
+
+        self.loaded = {}
+
+
+
+    def __getitem__(self, name):
+
+        if name not in self.loaded:
+
+            if name not in self.names:
+                raise KeyError(name)
+
+            self.loaded[name] = MCU(name)
+
+        return self.loaded[name]
+
+
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f'<MCUS {', '.join(
+            f'{name}{'' if name in self.loaded else ' (unloaded)'}'
+            for name in self.names
+        )}>'
+
+MCUS = MCUS()
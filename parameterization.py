@@ -1,5 +1,550 @@
-import types, collections, difflib
-from ..stpy.mcus import MCUS, TBD, Mapping
+import types, collections, collections.abc, math, fractions, pathlib, hashlib, pickle, sqlite3, contextlib, time, multiprocessing, concurrent.futures, json, os
+from ..stpy.mcus import MCUS, TBD, Handle, RealMinMax, IntMinMax, Choices, Mapping
+
+
+
+################################################################################
+#
+# Anything derived from the parameterization that outlives the process
+# (e.g. the PLL cache, lockfiles) is tagged with the checksum of this very
+# file, so a change to how things are solved invalidates it.
+#
+
+
+
+SOURCE_CHECKSUM = hashlib.sha256(pathlib.Path(__file__).read_bytes()).hexdigest()
+
+
+
+################################################################################
+#
+# Lots of targets end up asking for the exact same PLL configuration
+# (same kernel frequency, same channel frequencies, etc.), so the
+# assignment found for a PLL unit gets memoized; a later request that
+# is the same can then just write the assignment back without searching.
+# Infeasible requests are remembered too (as None) since those are the
+# most expensive to search through.
+#
+# The cache always lives in memory for the duration of the process,
+# but it can also be persisted to an SQLite file so that later runs
+# can benefit. Both are bounded in size by evicting whatever was
+# least recently used. The keys include the checksums of the MCU
+# database and of this very file, so a stale solution is never used.
+#
+
+
+
+PLL_CACHE_CAPACITY = 4096
+
+
+
+class PLLCache:
+
+
+
+    def __init__(self):
+
+        self.memory = collections.OrderedDict()
+
+
+
+    # The on-disk cache is best-effort; if the file can't
+    # be accessed, then we just go without it.
+
+    def connect(self, path):
+
+        connection = sqlite3.connect(path, timeout = 10)
+
+        connection.execute('''
+            CREATE TABLE IF NOT EXISTS solutions (
+                key      TEXT PRIMARY KEY,
+                solution BLOB,
+                used     REAL -- When the solution was last looked up.
+            )
+        ''')
+
+        return connection
+
+
+
+    # Returns `...` if there's no solution cached.
+
+    def fetch(self, key, path):
+
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+
+        if path is None:
+            return ...
+
+        try:
+
+            with contextlib.closing(self.connect(path)) as connection, connection:
+
+                row = connection.execute(
+                    'SELECT solution FROM solutions WHERE key = ?',
+                    (repr(key),)
+                ).fetchone()
+
+                if row is None:
+                    return ...
+
+                connection.execute(
+                    'UPDATE solutions SET used = ? WHERE key = ?',
+                    (time.time(), repr(key))
+                )
+
+        except sqlite3.Error:
+            return ...
+
+        # A solution that can't be unpickled (e.g. the file got
+        # corrupted) is as good as not having one cached at all.
+
+        solution, = row
+
+        try:
+            solution = pickle.loads(solution)
+        except (pickle.UnpicklingError, EOFError, ValueError, TypeError, IndexError, AttributeError, ImportError, KeyError):
+            return ...
+
+        if solution is not None and not isinstance(solution, dict):
+            return ...
+
+        self.remember(key, solution)
+
+        return solution
+
+
+
+    def store(self, key, solution, path):
+
+        self.remember(key, solution)
+
+        if path is None:
+            return
+
+        try:
+
+            with contextlib.closing(self.connect(path)) as connection, connection:
+
+                connection.execute(
+                    'INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)',
+                    (repr(key), pickle.dumps(solution, protocol = pickle.HIGHEST_PROTOCOL), time.time())
+                )
+
+                connection.execute(
+                    '''
+                        DELETE FROM solutions WHERE key NOT IN (
+                            SELECT key FROM solutions ORDER BY used DESC LIMIT ?
+                        )
+                    ''',
+                    (PLL_CACHE_CAPACITY,)
+                )
+
+        except sqlite3.Error:
+            pass
+
+
+
+    def remember(self, key, solution):
+
+        self.memory[key] = solution
+        self.memory.move_to_end(key)
+
+        while len(self.memory) > PLL_CACHE_CAPACITY:
+            self.memory.popitem(last = False)
+
+
+
+PLLCache = PLLCache()
+
+
+
+################################################################################
+#
+# Once the clock tree has been figured out, the peripheral solvers
+# (UXARTs, I2Cs, timers, etc.) only read clock values and write to
+# keys that no other solver writes to, so they can be run in parallel.
+#
+# The solvers are closures over the parameterization, so rather than
+# pickling them, the worker processes are forked off with everything
+# already in memory; a worker just runs the solver it's told to on its
+# own copy of the determined state and sends back whatever it changed.
+# The changes are then merged in the same order that the solvers would've
+# been ran sequentially, so the result is the same either way.
+#
+
+
+
+forked_solvers = None
+
+
+
+def run_forked_solver(index):
+
+    parameterization, solvers = forked_solvers
+
+    before            = dict(parameterization.determined.changes)
+    footprints_before = set(parameterization.footprints)
+
+    solvers[index]()
+
+    after = parameterization.determined.changes
+
+    return (
+        {
+            handle : value
+            for handle, value in after.items()
+            if before.get(handle, ...) is not value
+        },
+        [
+            handle
+            for handle in before
+            if handle not in after
+        ],
+        {
+            identity : footprint
+            for identity, footprint in parameterization.footprints.items()
+            if identity not in footprints_before
+        },
+        parameterization.stats,
+    )
+
+
+
+def run_solvers_concurrently(parameterization, solvers, workers):
+
+    global forked_solvers
+
+    forked_solvers = (parameterization, solvers)
+
+    try:
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers = min(workers, len(solvers)),
+            mp_context  = multiprocessing.get_context('fork'),
+        ) as executor:
+
+            futures = [
+                executor.submit(run_forked_solver, index)
+                for index in range(len(solvers))
+            ]
+
+
+
+            # If a solver failed, the error is raised as it would've
+            # been in sequential order; the other solvers are dropped.
+
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                executor.shutdown(cancel_futures = True)
+                raise
+
+    finally:
+        forked_solvers = None
+
+
+
+################################################################################
+#
+# A target only ends up touching a few hundred of the thousands of
+# entries in the MCU's database, so rather than copying every default
+# value over for each parameterization, the determined state is an
+# overlay that only stores the values that were written; everything
+# else is read from the MCU's defaults, which are shared.
+#
+# Likewise, whether or not a key is pinned is derived from the defaults
+# (a predefined value can't be changed), so only the keys that are pinned
+# on top of that (e.g. by the target's schema) need to be kept track of.
+#
+
+
+
+class Overlay(collections.abc.MutableMapping):
+
+
+
+    # Values are stored by the key's handle,
+    # but the overlay can still be used like a
+    # dictionary of the proper keys.
+
+    def __init__(self, mcu):
+        self.mcu     = mcu
+        self.changes = {}
+
+    def __getitem__(self, key):
+
+        handle = self.mcu.handles[key]
+
+        if not self.mcu.holds_value[handle]:
+            raise KeyError(key)
+
+        if handle in self.changes:
+            return self.changes[handle]
+
+        return self.mcu.defaults[handle]
+
+    def __setitem__(self, key, value):
+        self.changes[self.mcu.handles[key]] = value
+
+    def __delitem__(self, key):
+        del self.changes[self.mcu.handles[key]]
+
+    def __iter__(self):
+        return (self.mcu.keys[handle] for handle in self.mcu.valued)
+
+    def __len__(self):
+        return len(self.mcu.valued)
+
+    # Only the MCU's name is pickled rather than its entire database.
+
+    def __getstate__(self):
+        return (self.mcu.name, self.changes)
+
+    def __setstate__(self, state):
+        name, self.changes = state
+        self.mcu           = MCUS[name]
+
+
+
+class PinnedKeys(collections.abc.MutableSet):
+
+
+
+    # Keys can be given either by name or by handle.
+
+    def __init__(self, mcu):
+        self.mcu       = mcu
+        self.additions = set()
+
+    def __contains__(self, key):
+
+        if key.__class__ is not Handle:
+            key = self.mcu.handles.get(key, None)
+
+        return key in self.additions or key in self.mcu.predefined
+
+    def __iter__(self):
+        for handle in self.mcu.predefined | self.additions:
+            yield self.mcu.keys[handle]
+
+    def __len__(self):
+        return len(self.mcu.predefined | self.additions)
+
+    def __getstate__(self):
+        return (self.mcu.name, self.additions)
+
+    def __setstate__(self, state):
+        name, self.additions = state
+        self.mcu             = MCUS[name]
+
+    def add(self, key):
+        self.additions.add(key if key.__class__ is Handle else self.mcu.handles[key])
+
+    def discard(self, key):
+        self.additions.discard(key if key.__class__ is Handle else self.mcu.handles.get(key, None))
+
+
+
+################################################################################
+#
+# When only a bit of the schema changes between runs (e.g. a baud rate
+# being tweaked during bring-up), most of the solvers would just end up
+# doing the exact same thing as before. So as a solver runs, the keys it
+# reads are recorded along with the values they had before the solver
+# started, as well as the values it left behind for the keys it wrote to.
+#
+# A later parameterization can then be given the previous one; when a
+# solver comes up whose recorded inputs still have the same values (and
+# none of the keys it touched were pinned or unpinned since), the solver
+# is skipped and its outputs are just written back. Otherwise, it's ran
+# again and gets a new footprint. Since footprints are recorded as the
+# keys are actually accessed, they don't have to be kept in sync with
+# the solvers by hand.
+#
+
+
+
+class Footprint:
+
+    def __init__(self):
+        self.inputs    = {} # Handle to the value before the solver ran.
+        self.originals = {} # Handle to the value before the solver first wrote to it.
+        self.outputs   = {} # Handle to the value the solver left behind.
+
+    def __getstate__(self):
+        return (self.inputs, self.outputs)
+
+    def __setstate__(self, state):
+        self.inputs, self.outputs = state
+        self.originals            = {}
+
+
+
+################################################################################
+#
+# The footprints can also be saved to a lockfile so that later builds
+# (e.g. release builds) can skip the solvers without needing the previous
+# parameterization in memory. The lockfile is JSON so it can be checked in
+# and diffed; tuples are written as arrays and TBD values as null (if
+# there's a value that'd be ambiguous like that, no lockfile is written).
+#
+# The lockfile is only used if it was made for the same MCU database and
+# by this very file; otherwise, or if it can't be read for whatever
+# reason, everything is just solved from scratch like usual. The values
+# in it are still checked against the constraints and then by the solver
+# itself before being used (see `replay` and `verify`), so a lockfile that
+# was edited by hand can't sneak in a bad value; the solver would just be
+# ran again.
+#
+
+
+
+def encode_lock_value(value):
+
+    if value is TBD or value is ...:
+        return None
+
+    if value is None or isinstance(value, list):
+        raise TypeError(value)
+
+    if isinstance(value, tuple):
+        return [encode_lock_value(element) for element in value]
+
+    return value
+
+
+
+def decode_lock_value(value):
+
+    if value is None:
+        return TBD
+
+    if isinstance(value, list):
+        return tuple(decode_lock_value(element) for element in value)
+
+    return value
+
+
+
+def read_lockfile(path, mcu):
+
+    try:
+
+        lock = json.loads(pathlib.Path(path).read_text())
+
+        if (lock['mcu'], lock['database'], lock['source']) != (mcu, MCUS[mcu].checksum, SOURCE_CHECKSUM):
+            return None
+
+        def handle_of(key):
+
+            handle = MCUS[mcu].handle(
+                key,
+                must_hold_value = True,
+                undefined_ok    = True,
+            )
+
+            if handle is None:
+                raise KeyError(key)
+
+            return handle
+
+        previous = types.SimpleNamespace(
+            mcu        = mcu,
+            pinned     = PinnedKeys(MCUS[mcu]),
+            footprints = {},
+        )
+
+        for key in lock['pinned']:
+            previous.pinned.add(handle_of(key))
+
+        for identity, inputs, outputs in lock['footprints']:
+
+            footprint         = Footprint()
+            footprint.inputs  = { handle_of(key) : decode_lock_value(value) for key, value in inputs }
+            footprint.outputs = {
+                handle_of(key) : ... if value is None else decode_lock_value(value)
+                for key, value in outputs
+            }
+
+            previous.footprints[decode_lock_value(identity)] = footprint
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return previous
+
+
+
+def write_lockfile(path, parameterization):
+
+    mcu = MCUS[parameterization.mcu]
+
+    # The predefined values are already accounted
+    # for by the checksum of the MCU's database.
+
+    def pairs(values):
+        return ',\n'.join(
+            f'                {json.dumps([mcu.keys[handle], encode_lock_value(value)])}'
+            for handle, value in values.items()
+            if handle not in mcu.predefined
+        )
+
+    try:
+
+        footprints = ',\n'.join(
+            f'        [\n'
+            f'            {json.dumps(encode_lock_value(identity))},\n'
+            f'            [\n{pairs(footprint.inputs)}\n            ],\n'
+            f'            [\n{pairs(footprint.outputs)}\n            ]\n'
+            f'        ]'
+            for identity, footprint in parameterization.footprints.items()
+        )
+
+        pinned = ',\n'.join(
+            f'        {json.dumps(mcu.keys[handle])}'
+            for handle in sorted(parameterization.pinned.additions)
+        )
+
+    except (TypeError, ValueError):
+        return
+
+    text = (
+        f'{{\n'
+        f'    "mcu"        : {json.dumps(parameterization.mcu)},\n'
+        f'    "database"   : {json.dumps(mcu.checksum)},\n'
+        f'    "source"     : {json.dumps(SOURCE_CHECKSUM)},\n'
+        f'    "pinned"     : [\n{pinned}\n    ],\n'
+        f'    "footprints" : [\n{footprints}\n    ]\n'
+        f'}}\n'
+    )
+
+
+
+    # Don't touch the lockfile if nothing changed
+    # so that build systems don't think it's stale.
+
+    path = pathlib.Path(path)
+
+    try:
+        if path.read_text() == text:
+            return
+    except OSError:
+        pass
+
+    temporary_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+
+    try:
+        temporary_path.write_text(text)
+        os.replace(temporary_path, path)
+    finally:
+        temporary_path.unlink(missing_ok = True)
+
+
+
+################################################################################
 
 
 
@@ -46,9 +591,9 @@ class Parameterization:
 
 
 
-        # Translate the given key.
+        # Resolve the given key.
 
-        proper_key = MCUS[self.mcu].translate(
+        handle = MCUS[self.mcu].handle(
             given_key,
             must_hold_value = True,
             undefined_ok    = False,
@@ -58,7 +603,10 @@ class Parameterization:
 
         # Ensure the new value fits the entry's constraint.
 
-        constraint = MCUS[self.mcu].database[proper_key].constraint
+        constraint = MCUS[self.mcu].entries[handle].constraint
+
+        if given_key.__class__ is Handle:
+            given_key = MCUS[self.mcu].keys[handle]
 
         if constraint is not None and not constraint.check(value):
 
@@ -72,7 +620,7 @@ class Parameterization:
 
         # Ensure the key's value can be changed.
 
-        if proper_key in self.pinned:
+        if handle in self.pinned:
 
             raise RuntimeError(
                 f'Attempting to write to pinned '
@@ -83,8 +631,17 @@ class Parameterization:
 
 
         # Alright, update the value!
+        # If there's a checkpoint, the old value is
+        # recorded so the write can be undone later
+        # (`...` if it was the default value).
+
+        if self.undo_log is not None:
+            self.undo_log.append((handle, self.determined.changes.get(handle, ...)))
 
-        self.determined[proper_key] = value
+        if self.footprint is not None and handle not in self.footprint.originals:
+            self.footprint.originals[handle] = self.determined.changes.get(handle, ...)
+
+        self.determined.changes[handle] = value
 
 
 
@@ -96,13 +653,18 @@ class Parameterization:
 
 
 
-        # Translate the given key.
+        # Resolve the given key, if it hasn't been already.
 
-        proper_key = MCUS[self.mcu].translate(
-            given_key,
-            must_hold_value = True,
-            undefined_ok    = when_undefined is not ...,
-        )
+        mcu = MCUS[self.mcu]
+
+        if given_key.__class__ is Handle and mcu.holds_value[given_key]:
+            handle = given_key
+        else:
+            handle = mcu.handle(
+                given_key,
+                must_hold_value = True,
+                undefined_ok    = when_undefined is not ...,
+            )
 
 
 
@@ -111,14 +673,30 @@ class Parameterization:
         # different MCU's database, so to keep the code logic
         # simple, we can allow for a fallback value.
 
-        if proper_key is None:
+        if handle is None:
             return when_undefined
 
 
 
         # Got the value!
 
-        return self.determined[proper_key]
+        changes = self.determined.changes
+        value   = changes[handle] if handle in changes else mcu.defaults[handle]
+
+
+
+        # If a solver is running, the value the key had
+        # before the solver started is what it depends on.
+
+        footprint = self.footprint
+
+        if footprint is not None and handle not in footprint.inputs:
+
+            original = footprint.originals.get(handle, value)
+
+            footprint.inputs[handle] = mcu.defaults[handle] if original is ... else original
+
+        return value
 
 
 
@@ -126,37 +704,88 @@ class Parameterization:
 
 
 
-    def __init__(self, target, mcu, schema, gpios, interrupts):
+    def __init__(
+        self,
+        target,
+        mcu,
+        schema,
+        gpios,
+        interrupts,
+        *,
+        pll_engine     = 'scalar',
+        pll_cache      = True,
+        pll_cache_path = None,
+        solver_workers = None,
+        previous       = None,
+        lockfile       = None,
+        collect_stats  = False,
+        stats_path     = None,
+    ):
 
-        self.target     = target
-        self.mcu        = mcu
-        self.schema     = schema
-        self.determined = {}
-        self.pinned     = set()
+        self.target         = target
+        self.mcu            = mcu
+        self.schema         = schema
+        self.pll_engine     = pll_engine
+        self.pll_cache      = pll_cache
+        self.pll_cache_path = pll_cache_path
+        self.solver_workers = solver_workers
+        self.determined     = Overlay(MCUS[self.mcu])
+        self.pinned         = PinnedKeys(MCUS[self.mcu])
+        self.undo_log       = None
+        self.footprint      = None
+        self.footprints     = {}
+        self.stats          = {} if collect_stats or stats_path is not None else None
 
 
 
-        ################################################################################
-        #
-        # Set stuff up for proper parameterization.
-        #
+        # The footprints of a previous parameterization
+        # are only of use if it was for the same MCU;
+        # if there isn't one, there might be a lockfile.
 
+        if previous is not None and previous.mcu != self.mcu:
+            previous = None
 
+        locked = None
 
-        # We copy over keys in the database that can be
-        # associated with a value; for any that are already
-        # predefined, we can pin it so we avoid accidentally
-        # overwriting it.
+        if previous is None and lockfile is not None:
+            previous = locked = read_lockfile(lockfile, self.mcu)
 
-        for key, entry in MCUS[self.mcu].database.items():
 
-            if not hasattr(entry, 'value'):
-                continue
 
-            self.determined[key] = entry.value
+        # The PLLs can either be solved one candidate at a time
+        # or by evaluating the whole search space with NumPy.
 
-            if entry.value is not TBD:
-                self.pinned |= { key }
+        if self.pll_engine not in ('scalar', 'numpy'):
+
+            raise ValueError(
+                f'For target {repr(self.target)}, '
+                f'unknown PLL engine {repr(self.pll_engine)}; '
+                f'must be either \'scalar\' or \'numpy\'.'
+            )
+
+
+
+        # The peripheral solvers are either ran one after
+        # another or spread across some worker processes.
+
+        if self.solver_workers is not None and not (
+            isinstance(self.solver_workers, int) and
+            not isinstance(self.solver_workers, bool) and
+            self.solver_workers >= 1
+        ):
+
+            raise ValueError(
+                f'For target {repr(self.target)}, '
+                f'the amount of solver workers must be a positive integer '
+                f'or None; got {repr(self.solver_workers)}.'
+            )
+
+
+
+        ################################################################################
+        #
+        # Set stuff up for proper parameterization.
+        #
 
 
 
@@ -176,10 +805,74 @@ class Parameterization:
 
         # Decorater to indicate the entry-point
         # to when we are starting to brute-force.
+        # While the solvers are being deferred (see `run_solvers_concurrently`),
+        # they're just collected to be ran later instead.
+        #
+        # If statistics are being collected, the solver that's
+        # currently running gets its tally updated by `each` and
+        # `checkout`; otherwise, the tally is just None.
+
+        deferred_solvers = None
+        tally            = None
+        guide            = None
+
+        def bruteforce(function, *arguments):
+
+            nonlocal tally
+
+            identity = (function.__name__, *arguments)
+
+
+
+            # The statistics are kept in the order that the solvers
+            # are brute-forced in, even if they're ran concurrently.
+
+            if self.stats is not None:
+
+                tally = self.stats[identity] = types.SimpleNamespace(
+                    seconds    = 0,
+                    candidates = 0,
+                    accepted   = 0,
+                    rejected   = 0,
+                    replayed   = False,
+                )
+
+                started = time.perf_counter()
+
+            if replay(function, *arguments):
 
-        def bruteforce(function):
+                if tally is not None:
+                    tally.seconds  = time.perf_counter() - started
+                    tally.replayed = True
 
-            success = function()
+            elif deferred_solvers is not None:
+                deferred_solvers.append(lambda: solve(function, *arguments))
+
+            else:
+                solve(function, *arguments)
+
+            tally = None
+
+
+
+        def solve(function, *arguments):
+
+            nonlocal tally
+
+            if self.stats is not None:
+                tally   = self.stats[(function.__name__, *arguments)]
+                started = time.perf_counter()
+
+            self.footprint = Footprint()
+
+            try:
+                success = function(*arguments)
+            finally:
+
+                footprint, self.footprint = self.footprint, None
+
+                if tally is not None:
+                    tally.seconds = time.perf_counter() - started
 
             if not success:
 
@@ -188,17 +881,230 @@ class Parameterization:
                     f'for target {repr(self.target)}.'
                 )
 
+            footprint.outputs = {
+                handle : self.determined.changes.get(handle, ...)
+                for handle, original in footprint.originals.items()
+                if self.determined.changes.get(handle, ...) is not original
+            }
+
+            footprint.originals = {}
+
+            self.footprints[(function.__name__, *arguments)] = footprint
+
+
+
+        # See if the solver would end up doing the same
+        # thing as it did in the previous parameterization;
+        # if so, just write back what it did (see `Footprint`).
+
+        def replay(function, *arguments):
+
+            if previous is None:
+                return False
+
+            identity  = (function.__name__, *arguments)
+            footprint = previous.footprints.get(identity, None)
+
+            if footprint is None:
+                return False
+
+            repinned = self.pinned.additions ^ previous.pinned.additions
+
+            if any(handle in repinned for handle in (*footprint.inputs, *footprint.outputs)):
+                return False
+
+            for handle, value in footprint.inputs.items():
+                if not same(self(handle), value):
+                    return False
+
+            for handle, value in footprint.outputs.items():
+
+                if handle in self.pinned:
+                    return False
+
+                constraint = MCUS[self.mcu].entries[handle].constraint
+
+                if value is not ... and constraint is not None and not constraint.check(value):
+                    return False
+
+            if previous is locked and not verify(function, arguments, footprint):
+                return False
+
+            for handle, value in footprint.outputs.items():
+                if value is ...:
+                    self.determined.changes.pop(handle, None)
+                else:
+                    self.determined.changes[handle] = value
+
+            self.footprints[identity] = footprint
+
+            return True
+
+
+
+        def same(value, other):
+            return value is other or (value.__class__ is other.__class__ and value == other)
+
+
+
+        #
+        # A lockfile could've been edited by hand (or gone stale in a way
+        # the checksums don't catch), so the values in it being within the
+        # constraints doesn't mean they actually go together; a doubled timer
+        # divider, for instance, would still be a valid divider. So before a
+        # footprint from a lockfile is used, the solver is ran again, but with
+        # its search steered straight to the locked values (see `steer`).
+        # This way, the solver re-checks the relations it always would've
+        # (e.g. VCO = reference / predivider * multiplier, or the baud rate
+        # being within tolerance) without having to search for anything.
+        # The footprint is only used if the solver succeeds and leaves
+        # behind the exact same values; either way, what the solver wrote
+        # is rolled back, and if the footprint isn't used, the solver is
+        # then just ran like usual.
+        #
+
+
+
+        def verify(function, arguments, footprint):
+
+            nonlocal guide
+
+            mark           = checkpoint()
+            guide          = footprint.outputs
+            self.footprint = Footprint()
+
+            try:
+
+                success = function(*arguments)
+                outputs = {
+                    handle : self.determined.changes.get(handle, ...)
+                    for handle in self.footprint.originals
+                }
+
+            finally:
+                guide          = None
+                self.footprint = None
+                rollback(mark)
+                release(mark)
+
+            if not success:
+                return False
+
+            for handle in outputs.keys() | footprint.outputs.keys():
+
+                original = self.determined.changes.get(handle, ...)
+
+                if not same(outputs.get(handle, original), footprint.outputs.get(handle, original)):
+                    return False
+
+            return True
+
+
+
+        # Trial assignments done by `each` and `checkout` write
+        # values that have already been taken from or checked against
+        # the key's constraint, so going through `__setitem__` would
+        # just be redundantly resolving the key and checking the
+        # value again; instead, the key is resolved once up front
+        # into a handle and the values are written directly.
+        # The pinned check still needs to be done though.
+        #
+        # Solvers that access the same keys over and over again
+        # can also resolve them into handles once beforehand;
+        # handles can be used wherever a key is expected.
+
+        def resolve(key):
+
+            return MCUS[self.mcu].handle(
+                key,
+                must_hold_value = True,
+                undefined_ok    = False,
+            )
+
+
+
+        def assign(given_key, handle, value):
+
+            if handle in self.pinned:
+
+                if given_key.__class__ is Handle:
+                    given_key = MCUS[self.mcu].keys[handle]
+
+                raise RuntimeError(
+                    f'Attempting to write to pinned '
+                    f'key {repr(given_key)} for target '
+                    f'{repr(self.target)} ({repr(self.mcu)}).'
+                )
+
+            if self.undo_log is not None:
+                self.undo_log.append((handle, self.determined.changes.get(handle, ...)))
+
+            if self.footprint is not None and handle not in self.footprint.originals:
+                self.footprint.originals[handle] = self.determined.changes.get(handle, ...)
+
+            self.determined.changes[handle] = value
+
+
+
+        # While a footprint from a lockfile is being verified,
+        # the values a solver would go through for a key (or
+        # a tuple of keys) are narrowed down to just the
+        # locked one (see `verify`).
+
+        def steer(handles, values):
+
+            if guide is None:
+                return values
+
+            if handles.__class__ is not tuple:
+                handles = (handles,)
+
+            locked_values = tuple(guide.get(handle, ...) for handle in handles)
+
+            if any(value is ... for value in locked_values):
+                return values
+
+            if len(handles) == 1:
+                locked_values, = locked_values
+
+            return iter((locked_values,))
+
 
 
         # Shorthand to update the value of a database entry
         # by iterating over all the possible valid values
-        # it can be.
+        # it can be. If an interval is given, only the values
+        # within it are iterated over (see `propagate`).
+
+        def each(key, *, within = None):
+
+            handle     = resolve(key)
+            constraint = MCUS[self.mcu].entries[handle].constraint
+            values     = constraint.iterate()
+
+            if within is not None:
 
-        def each(key):
+                lower, upper = within
 
-            for self[key] in MCUS[self.mcu][key].constraint.iterate():
+                if isinstance(constraint, IntMinMax):
+                    values = iter(range(
+                        max(constraint.minimum, math.ceil (lower)),
+                        min(constraint.maximum, math.floor(upper)) + 1
+                    ))
+                else:
+                    values = (value for value in values if lower <= value <= upper)
+
+            values  = steer(handle, values)
+            counted = tally
+
+            for value in values:
+
+                assign(key, handle, value)
 
-                yield self(key)
+                if counted is not None:
+                    counted.candidates += 1
+
+                yield value
 
 
 
@@ -208,14 +1114,181 @@ class Parameterization:
         # simple that we can check the membership of;
         # things like tuples, dictionaries, or ranges.
 
-        def checkout(key, value):
+        def checkout(key, value):
+
+            handle = resolve(key)
+
+            ok = value is not TBD and MCUS[self.mcu].entries[handle].constraint.check(value)
+
+            if ok:
+                assign(key, handle, value)
+
+            if tally is not None:
+                if ok:
+                    tally.accepted += 1
+                else:
+                    tally.rejected += 1
+
+            return ok
+
+
+
+        #
+        # When a branch of the search fails, whatever it wrote to the
+        # determined state (e.g. `SYS_CK` or a PLL's dividers) would be
+        # left behind for the next branch to trip over. So while there's
+        # a checkpoint, every write gets the previous value recorded in
+        # an undo log, and rolling back to the checkpoint is just a matter
+        # of popping the log back to where it was, which is proportional
+        # to the number of changes made rather than the size of the state.
+        #
+        # Checkpoints can be nested; the log is only kept around while
+        # the outermost one is still active.
+        #
+
+
+
+        def checkpoint():
+
+            if self.undo_log is None:
+                self.undo_log = []
+
+            return len(self.undo_log)
+
+
+
+        def rollback(mark):
+
+            while len(self.undo_log) > mark:
+
+                handle, value = self.undo_log.pop()
+
+                if value is ...:
+                    self.determined.changes.pop(handle, None)
+                else:
+                    self.determined.changes[handle] = value
+
+
+
+        def release(mark):
+
+            if mark == 0:
+                self.undo_log = None
+
+
+
+        # Do a branch of the search, undoing it if it didn't work out.
+
+        def attempt(function, *arguments):
+
+            mark = checkpoint()
+
+            try:
+
+                success = function(*arguments)
+
+                if not success:
+                    rollback(mark)
+
+            finally:
+                release(mark)
+
+            return success
+
+
+
+        #
+        # Generate-and-test with `each` and `checkout` ends up trying a lot
+        # of values that couldn't have possibly worked, so before enumerating,
+        # the bounds of the keys involved can be narrowed down first.
+        #
+        # Each key (or any other quantity, like an intermediate frequency)
+        # is given an interval domain, and relations of the form
+        # `product = multiplicand * multiplier` are used to narrow the domains
+        # of each other until nothing changes anymore. All the quantities are
+        # assumed to be positive; relations that aren't are just skipped.
+        #
+        # The narrowed bounds are widened by a tiny bit on each step so that
+        # floating-point rounding never causes a value that'd actually pass
+        # the checks to be pruned; the result of the search is unaffected,
+        # only the number of values visited.
+        #
+
+
+
+        def domain(key):
+
+            if key in self.pinned:
+                return (self(key), self(key))
+
+            constraint = MCUS[self.mcu][key].constraint
+
+            if isinstance(constraint, (IntMinMax, RealMinMax)):
+                return (constraint.minimum, constraint.maximum)
+
+            match constraint:
+                case Choices() : values = constraint.values
+                case Mapping() : values = constraint.dictionary.keys()
+                case _         : values = ()
+
+            numbers = [
+                number
+                for value in values
+                for number in (value if isinstance(value, tuple) else (value,))
+                if isinstance(number, (int, float)) and not isinstance(number, bool)
+            ]
+
+            if not numbers:
+                return (-math.inf, math.inf)
+
+            return (min(numbers), max(numbers))
+
+
+
+        def propagate(domains, relations):
+
+            domains = dict(domains)
+            slack   = 1e-9
+
+            for _ in range(16):
+
+                changed = False
+
+                for product, multiplicand, multiplier in relations:
+
+                    (product_lower     , product_upper     ) = domains[product     ]
+                    (multiplicand_lower, multiplicand_upper) = domains[multiplicand]
+                    (multiplier_lower  , multiplier_upper  ) = domains[multiplier  ]
+
+                    if min(product_lower, multiplicand_lower, multiplier_lower) <= 0:
+                        continue
+
+                    for name, lower, upper in (
+                        (product     , multiplicand_lower * multiplier_lower, multiplicand_upper * multiplier_upper),
+                        (multiplicand, product_lower / multiplier_upper     , product_upper / multiplier_lower      ),
+                        (multiplier  , product_lower / multiplicand_upper   , product_upper / multiplicand_lower    ),
+                    ):
+
+                        current_lower, current_upper = domains[name]
+
+                        lower = max(current_lower, lower * (1 - slack))
+                        upper = min(current_upper, upper * (1 + slack))
+
+                        if lower > upper:
+                            return None
+
+                        if (
+                            lower > current_lower * (1 + slack) or
+                            upper < current_upper * (1 - slack)
+                        ):
+                            changed = True
 
-            ok = value is not TBD and MCUS[self.mcu][key].constraint.check(value)
+                        domains[name] = (lower, upper)
 
-            if ok:
-                self[key] = value
+                if not changed:
+                    break
 
-            return ok
+            return domains
 
 
 
@@ -247,22 +1320,17 @@ class Parameterization:
             # Check to make sure the interrupts
             # to be used by the target exists.
 
-            if interrupt.name not in MCUS[self.mcu]['INTERRUPTS'].value:
+            if interrupt.name not in MCUS[self.mcu].interrupt_numbers:
 
                 raise ValueError(
                     f'For target {repr(self.target)}, '
                     f'no such interrupt {repr(interrupt.name)} '
                     f'exists on {repr(self.mcu)}; '
                     f'did you mean any of the following? : '
-                    f'{difflib.get_close_matches(
-                        str(interrupt.name),
-                        map(str, MCUS[self.mcu]['INTERRUPTS'].value),
-                        n      = 5,
-                        cutoff = 0
-                    )}'
+                    f'{MCUS[self.mcu].close_interrupts(interrupt.name, 5)}'
                 )
 
-            interrupt.number = MCUS[self.mcu]['INTERRUPTS'].value.index(interrupt.name) - 15
+            interrupt.number = MCUS[self.mcu].interrupt_numbers[interrupt.name]
 
 
 
@@ -443,19 +1511,16 @@ class Parameterization:
 
                 case 'ANALOG':
 
-                    for pin, adc_units, analog_channel_number in self('ADC_CONNECTIVITY'):
-
-                        if pin == gpio.pin:
-                            gpio.adc_unit              = adc_units[0] # TODO For now, always using the first ADC if possible.
-                            gpio.analog_channel_number = analog_channel_number
-                            break
+                    adc_channels = MCUS[self.mcu].adc_channels.get((gpio.port, gpio.number), None)
 
-                    else:
+                    if not adc_channels:
                         raise ValueError(
                             f'For target {repr(self.target)} ({repr(self.mcu)}), '
                             f'GPIO pin {repr(gpio.pin)} has no support for analog.'
                         )
 
+                    gpio.adc_unit, gpio.analog_channel_number = adc_channels[0] # TODO For now, always using the first ADC if possible.
+
 
 
                 # A GPIO that's marked as `None` is often useful
@@ -485,17 +1550,39 @@ class Parameterization:
 
             if gpio.pin is not None and gpio.altfunc is not None:
 
-                gpio.afsel = MCUS[self.mcu].gpio_afsel_table.get(
-                    (gpio.port, gpio.number, gpio.altfunc),
-                    None
-                )
+                pin = MCUS[self.mcu].gpios.get((gpio.port, gpio.number), None)
 
-                if gpio.afsel is None:
+                if pin is not None:
+                    gpio.afsel = pin.alternate_functions.get(gpio.altfunc, None)
+
+                if gpio.afsel is None and gpio.altfunc in MCUS[self.mcu].alternate_function_pins:
 
                     raise ValueError(
                         f'For target {repr(self.target)} ({repr(self.mcu)}), '
                         f'GPIO pin {repr(gpio.pin)} has no support for '
-                        f'alternate function {repr(gpio.altfunc)}.'
+                        f'alternate function {repr(gpio.altfunc)}; '
+                        f'pins that do: {[
+                            f'{port}{number}'
+                            for port, number in MCUS[self.mcu].alternate_function_pins[gpio.altfunc]
+                        ]}.'
+                    )
+
+
+
+                # No pin has the alternate function at all (e.g. a typo),
+                # so list what the peripheral does have instead, if anything.
+
+                if gpio.afsel is None:
+
+                    peripheral, *_ = gpio.altfunc.split('_', 1)
+
+                    raise ValueError(
+                        f'For target {repr(self.target)} ({repr(self.mcu)}), '
+                        f'no pin has alternate function {repr(gpio.altfunc)}; '
+                        f'the alternate functions of {repr(peripheral)} are: {[
+                            f'{port}{number} ({alternate_function})'
+                            for port, number, alternate_function in MCUS[self.mcu].peripheral_pins.get(peripheral, ())
+                        ]}.'
                     )
 
 
@@ -622,37 +1709,6 @@ class Parameterization:
 
 
 
-        ################################################################################
-        #
-        # Flash and Internal Voltage.
-        #
-        # TODO The settings should be dependent upon the AXI frequency,
-        #      but for simplicity right now, we're using the max flash
-        #      delay and highest voltage scaling. This means flash will
-        #      probably be slower than needed and more power might be
-        #      used unnecessarily.
-        #
-
-
-
-        match self.mcu:
-
-
-
-            # @/pg 252/tbl 45/`H533rm`.
-            # @/pg 438/sec 10.11.4/`H533rm`.
-
-            case 'STM32H533RET6' | 'STM32H533VET6':
-                self['FLASH_LATENCY'           ] = 5
-                self['FLASH_PROGRAMMING_DELAY' ] = '0b10'
-                self['INTERNAL_VOLTAGE_SCALING'] = 'VOS0'
-
-
-
-            case _: raise NotImplementedError
-
-
-
         ################################################################################
         #
         # Power-Supply Setup.
@@ -760,9 +1816,45 @@ class Parameterization:
 
 
 
-        def each_vco_frequency(unit, kernel_frequency):
+        def each_vco_frequency(unit, kernel_frequency, channel_frequencies):
+
+
+
+            # Narrow down the predividers and multipliers
+            # to those that could possibly work out.
+
+            relations = [
+                ('PLL_KERNEL_FREQ'     , 'PLL_INPUT_FREQ', f'PLL{unit}_PREDIVIDER'),
+                (f'PLL{unit}_VCO_FREQ' , 'PLL_INPUT_FREQ', f'PLL{unit}_MULTIPLIER'),
+                *(
+                    (f'PLL{unit}_VCO_FREQ', f'PLL{unit}{channel}_CK', f'PLL{unit}{channel}_DIVIDER')
+                    for channel in channel_frequencies
+                ),
+            ]
+
+            domains = propagate(
+                {
+                    'PLL_KERNEL_FREQ'      : (kernel_frequency, kernel_frequency),
+                    'PLL_INPUT_FREQ'       : domain(f'PLL{unit}_INPUT_RANGE'),
+                    f'PLL{unit}_PREDIVIDER': domain(f'PLL{unit}_PREDIVIDER'),
+                    f'PLL{unit}_MULTIPLIER': domain(f'PLL{unit}_MULTIPLIER'),
+                    f'PLL{unit}_VCO_FREQ'  : domain(f'PLL{unit}_VCO_FREQ'  ),
+                    **{
+                        f'PLL{unit}{channel}_CK' : (channel_frequency, channel_frequency)
+                        for channel, channel_frequency in channel_frequencies.items()
+                    },
+                    **{
+                        f'PLL{unit}{channel}_DIVIDER' : domain(f'PLL{unit}{channel}_DIVIDER')
+                        for channel in channel_frequencies
+                    },
+                },
+                relations
+            )
+
+            if domains is None:
+                return
 
-            for predivider in each(f'PLL{unit}_PREDIVIDER'):
+            for predivider in each(f'PLL{unit}_PREDIVIDER', within = domains[f'PLL{unit}_PREDIVIDER']):
 
                 input_frequency = kernel_frequency / predivider
 
@@ -778,9 +1870,18 @@ class Parameterization:
 
 
 
-                # Try every available multiplier that the PLL can handle.
+                # Try every available multiplier that the PLL can handle
+                # with this predivider.
 
-                for multiplier in each(f'PLL{unit}_MULTIPLIER'):
+                narrowed_domains = propagate(
+                    domains | { f'PLL{unit}_PREDIVIDER' : (predivider, predivider) },
+                    relations
+                )
+
+                if narrowed_domains is None:
+                    continue
+
+                for multiplier in each(f'PLL{unit}_MULTIPLIER', within = narrowed_domains[f'PLL{unit}_MULTIPLIER']):
 
                     if checkout(
                         f'PLL{unit}_VCO_FREQ',
@@ -790,6 +1891,250 @@ class Parameterization:
 
 
 
+        #
+        # Going through every predivider and multiplier is a lot of
+        # wasted effort since most combinations will result in a VCO
+        # frequency that can't be divided down exactly to what the
+        # channels need. For channel frequency CK and kernel frequency K,
+        # the channel divider is:
+        # >
+        # >    VCO / CK = (K / M * N) / CK = K * N / (M * CK)
+        # >
+        # This is only an integer when the multiplier N is a multiple of
+        # `M * CK / gcd(K, M * CK)`, so for a given predivider M, the only
+        # multipliers worth trying are the multiples of the LCM of those
+        # across all the used channels, and only within the range where
+        # the VCO frequency and the channel dividers are within bounds.
+        #
+        # The candidates are yielded in the same order that the exhaustive
+        # search would've tried them, so the first one that satisfies
+        # everything is the same solution either way. This only works
+        # out for integer frequencies though; otherwise, we'll have to
+        # resort to the exhaustive search.
+        #
+
+
+
+        def each_pll_candidate(unit, kernel_frequency, channel_frequencies):
+
+            kernel_frequency    = round(kernel_frequency)
+            channel_frequencies = {
+                channel : round(frequency)
+                for channel, frequency in channel_frequencies.items()
+            }
+
+            predividers  = MCUS[self.mcu][f'PLL{unit}_PREDIVIDER' ].constraint
+            input_ranges = MCUS[self.mcu][f'PLL{unit}_INPUT_RANGE'].constraint
+            multipliers  = MCUS[self.mcu][f'PLL{unit}_MULTIPLIER' ].constraint
+            vco          = MCUS[self.mcu][f'PLL{unit}_VCO_FREQ'   ].constraint
+
+            for predivider in predividers.iterate():
+
+                input_frequency = kernel_frequency / predivider
+
+
+
+                # Determine the range of the PLL input frequency.
+
+                for input_range in input_ranges.iterate():
+
+                    lower, upper = input_range
+
+                    if lower <= input_frequency < upper:
+                        break
+
+                else:
+                    continue
+
+
+
+                # Narrow down the multipliers to those that'll give
+                # a VCO frequency within range and satisfy every channel.
+
+                ratio = fractions.Fraction(predivider, kernel_frequency) # Multiplier per Hz of VCO frequency.
+                step  = 1
+                lower = max(multipliers.minimum, math.ceil (ratio * fractions.Fraction(vco.minimum)))
+                upper = min(multipliers.maximum, math.floor(ratio * fractions.Fraction(vco.maximum)))
+
+                for channel, channel_frequency in channel_frequencies.items():
+
+                    dividers = MCUS[self.mcu][f'PLL{unit}{channel}_DIVIDER'].constraint
+                    step     = math.lcm(step, predivider * channel_frequency // math.gcd(kernel_frequency, predivider * channel_frequency))
+                    lower    = max(lower, math.ceil (ratio * channel_frequency * dividers.minimum))
+                    upper    = min(upper, math.floor(ratio * channel_frequency * dividers.maximum))
+
+                for multiplier in range(-(-lower // step) * step, upper + 1, step):
+                    yield predivider, input_range, multiplier
+
+
+
+        #
+        # When sweeping through lots of clock plans, it's cheaper to just
+        # evaluate the entire predivider-multiplier grid all at once with
+        # NumPy. This does the exact same floating-point arithmetic as the
+        # exhaustive search, just element-wise, and the feasible candidates
+        # come out in the same row-major order (predivider first, then
+        # multiplier), so the solution is the same as the scalar path.
+        # Unlike the analytical solver, this also works for non-integer
+        # frequencies.
+        #
+        # NumPy is only needed when this engine is selected.
+        #
+
+
+
+        def each_pll_candidate_vectorized(unit, kernel_frequency, channel_frequencies):
+
+            import numpy
+
+            input_ranges = list(MCUS[self.mcu][f'PLL{unit}_INPUT_RANGE'].constraint.iterate())
+            vco          = MCUS[self.mcu][f'PLL{unit}_VCO_FREQ'].constraint
+            predividers  = numpy.fromiter(MCUS[self.mcu][f'PLL{unit}_PREDIVIDER'].constraint.iterate(), dtype = numpy.int64)
+            multipliers  = numpy.fromiter(MCUS[self.mcu][f'PLL{unit}_MULTIPLIER'].constraint.iterate(), dtype = numpy.int64)
+
+
+
+            # Determine the range of the PLL input frequency for each
+            # predivider; the first range that matches is the one used.
+
+            input_frequencies = kernel_frequency / predividers
+            range_indices     = numpy.full(predividers.shape, -1)
+
+            for range_index, (lower, upper) in enumerate(input_ranges):
+                range_indices[
+                    (range_indices == -1) &
+                    (lower <= input_frequencies) &
+                    (input_frequencies < upper)
+                ] = range_index
+
+
+
+            # Mask out the VCO frequencies that are out of range
+            # or can't be divided down exactly for every channel.
+
+            vco_frequencies = input_frequencies[:, None] * multipliers[None, :]
+
+            feasible = (
+                (range_indices != -1)[:, None] &
+                (vco.minimum <= vco_frequencies) &
+                (vco_frequencies <= vco.maximum)
+            )
+
+            for channel, channel_frequency in channel_frequencies.items():
+
+                dividers  = MCUS[self.mcu][f'PLL{unit}{channel}_DIVIDER'].constraint
+                quotients = vco_frequencies / channel_frequency
+                feasible &= (
+                    (quotients == numpy.floor(quotients)) &
+                    (dividers.minimum <= quotients) &
+                    (quotients <= dividers.maximum)
+                )
+
+            for predivider_index, multiplier_index in zip(*numpy.nonzero(feasible)):
+                yield (
+                    int(predividers[predivider_index]),
+                    input_ranges[range_indices[predivider_index]],
+                    int(multipliers[multiplier_index]),
+                )
+
+
+
+        #
+        #
+        #
+
+
+
+        def search_pll(unit, used_channels, kernel_frequency, channel_frequencies):
+
+
+
+            # The keys are used over and over again for
+            # every candidate, so resolve them once upfront.
+
+            predivider_handle  = resolve(f'PLL{unit}_PREDIVIDER' )
+            input_range_handle = resolve(f'PLL{unit}_INPUT_RANGE')
+            multiplier_handle  = resolve(f'PLL{unit}_MULTIPLIER' )
+            vco_handle         = resolve(f'PLL{unit}_VCO_FREQ'   )
+            channel_handles    = [
+                (resolve(f'PLL{unit}{channel}_DIVIDER'), resolve(f'PLL{unit}{channel}_CK'))
+                for channel in used_channels
+            ]
+
+
+
+            # Use the vectorized solver if it was asked for;
+            # otherwise, use the analytical solver whenever we can.
+
+            match self.pll_engine:
+
+                case 'numpy':
+                    candidates = each_pll_candidate_vectorized(unit, kernel_frequency, channel_frequencies)
+
+                case 'scalar' if all(
+                    isinstance(frequency, (int, float)) and frequency > 0 and float(frequency).is_integer()
+                    for frequency in (kernel_frequency, *channel_frequencies.values())
+                ):
+                    candidates = each_pll_candidate(unit, kernel_frequency, channel_frequencies)
+
+                case _:
+                    candidates = None
+
+            candidates = steer((predivider_handle, input_range_handle, multiplier_handle), candidates)
+
+            if candidates is not None:
+
+                for predivider, input_range, multiplier in candidates:
+
+                    self[predivider_handle ] = predivider
+                    self[input_range_handle] = input_range
+                    self[multiplier_handle ] = multiplier
+
+
+
+                    # Double-check with the exact same floating-point
+                    # arithmetic that the exhaustive search would've done.
+
+                    if not checkout(
+                        vco_handle,
+                        kernel_frequency / predivider * multiplier
+                    ):
+                        continue
+
+                    every_channel_satisfied = all(
+                        checkout(
+                            divider_handle,
+                            self(vco_handle) / self(channel_handle)
+                        )
+                        for divider_handle, channel_handle in channel_handles
+                    )
+
+                    if every_channel_satisfied:
+                        return True
+
+                return False
+
+
+
+            # Otherwise, search exhaustively.
+
+            for _ in each_vco_frequency(unit, kernel_frequency, channel_frequencies):
+
+                every_channel_satisfied = all(
+                    checkout(
+                        divider_handle,
+                        self(vco_handle) / self(channel_handle)
+                    )
+                    for divider_handle, channel_handle in channel_handles
+                )
+
+                if every_channel_satisfied:
+                    return True
+
+            return False
+
+
+
         #
         #
         #
@@ -818,21 +2163,67 @@ class Parameterization:
 
             self[f'PLL{unit}_ENABLE'] = True
 
-            for _ in each_vco_frequency(unit, kernel_frequency):
 
-                every_channel_satisfied = all(
-                    checkout(
-                        f'PLL{unit}{channel}_DIVIDER',
-                        self(f'PLL{unit}_VCO_FREQ') / self(f'PLL{unit}{channel}_CK')
-                    )
-                    for channel in used_channels
-                )
 
-                if every_channel_satisfied:
+            # See if the exact same PLL request has been solved before.
+            # The cache is left alone while verifying a lockfile
+            # so that it's the locked values that get checked.
+
+            channel_frequencies = {
+                channel : self(f'PLL{unit}{channel}_CK')
+                for channel in used_channels
+            }
+
+            solved_keys = [
+                f'PLL{unit}_PREDIVIDER',
+                f'PLL{unit}_INPUT_RANGE',
+                f'PLL{unit}_MULTIPLIER',
+                f'PLL{unit}_VCO_FREQ',
+                *(f'PLL{unit}{channel}_DIVIDER' for channel in used_channels),
+            ]
+
+            cache_key = (
+                MCUS[self.mcu].checksum,
+                SOURCE_CHECKSUM,
+                self.mcu,
+                unit,
+                kernel_frequency,
+                tuple(channel_frequencies.items()),
+                tuple((key, self(key)) for key in solved_keys if key in self.pinned),
+            )
+
+            if self.pll_cache and guide is None:
+
+                solution = PLLCache.fetch(cache_key, self.pll_cache_path)
+
+                if solution is None:
+                    return False
+
+                if solution is not ...:
+
+                    for key, value in solution.items():
+                        self[key] = value
+
                     return True
 
 
 
+            # Search for the PLL configuration and remember the result.
+
+            solved = search_pll(unit, used_channels, kernel_frequency, channel_frequencies)
+
+            if self.pll_cache and guide is None:
+
+                PLLCache.store(
+                    cache_key,
+                    { key : self(key) for key in solved_keys } if solved else None,
+                    self.pll_cache_path
+                )
+
+            return solved
+
+
+
         #
         #
         #
@@ -852,7 +2243,7 @@ class Parameterization:
 
                     return all(
                         any(
-                            parameterize_pll(unit, channels, self(kernel_source))
+                            attempt(parameterize_pll, unit, channels, self(kernel_source))
                             for kernel_source in each(f'PLL{unit}_KERNEL_SOURCE')
                         )
                         for unit, channels in self('PLLS')
@@ -873,64 +2264,193 @@ class Parameterization:
 
 
 
-        @bruteforce
-        def parameterize_scgu():
+        def parameterize_scgu_kernel_source(kernel_source):
 
-            for kernel_source in each('SCGU_KERNEL_SOURCE'):
+            kernel_frequency = self(kernel_source)
 
-                kernel_frequency = self(kernel_source)
+            if kernel_frequency is TBD:
+                return False
 
-                if kernel_frequency is TBD:
-                    continue
+            self['SYS_CK'] = kernel_frequency
 
-                self['SYS_CK'] = kernel_frequency
 
 
+            # CPU.
 
-                # CPU.
+            if not checkout(
+                'CPU_DIVIDER',
+                 kernel_frequency / self('CPU_CK')
+            ):
+                return False
 
-                if not checkout(
-                    'CPU_DIVIDER',
-                     kernel_frequency / self('CPU_CK')
-                ):
-                    continue
 
 
+            # AXI/AHB busses.
+
+            match self.mcu:
 
-                # AXI/AHB busses.
 
-                match self.mcu:
 
+                # The CPU and AXI/AHB bus are directly connected.
 
+                case 'STM32H533RET6' | 'STM32H533VET6':
 
-                    # The CPU and AXI/AHB bus are directly connected.
+                    self['AXI_AHB_CK'] = self('CPU_CK')
 
-                    case 'STM32H533RET6' | 'STM32H533VET6':
 
-                        self['AXI_AHB_CK'] = self('CPU_CK')
 
+                case _: raise NotImplementedError
 
 
-                    case _: raise NotImplementedError
 
+            # APB busses.
 
+            return all(
+                checkout(
+                    f'APB{unit}_DIVIDER',
+                    self('AXI_AHB_CK') / self(f'APB{unit}_CK')
+                )
+                for unit in self('APBS')
+            )
 
-                # APB busses.
 
-                every_apb_satisfied = all(
-                    checkout(
-                        f'APB{unit}_DIVIDER',
-                        self('AXI_AHB_CK') / self(f'APB{unit}_CK')
+
+        @bruteforce
+        def parameterize_scgu():
+
+            return any(
+                attempt(parameterize_scgu_kernel_source, kernel_source)
+                for kernel_source in each('SCGU_KERNEL_SOURCE')
+            )
+
+
+
+        ################################################################################
+        #
+        # Internal Voltage.
+        #
+        # A higher core voltage lets the clocks run faster, but at the cost
+        # of more power, so we go with the lowest voltage scaling that can
+        # still handle every frequency in the clock tree, unless the target
+        # would rather have fewer flash wait-states instead. The target can
+        # also just pin the voltage scaling to whatever it wants, in which
+        # case we only ensure the clock tree fits within it.
+        #
+        # The PLLs' VCOs are excluded since they have their own range.
+        # @/pg 438/sec 10.11.4/`H533rm`.
+        #
+
+
+
+        @bruteforce
+        def parameterize_internal_voltage_scaling():
+
+            vco_frequencies = {
+                MCUS[self.mcu].handle(f'PLL{unit}_VCO_FREQ', must_hold_value = True, undefined_ok = False)
+                for unit, channels in self('PLLS')
+            }
+
+            highest_frequency = max(
+                (
+                    frequency
+                    for handle in MCUS[self.mcu].clocktree
+                    if handle not in vco_frequencies
+                    if (frequency := self(handle)) is not TBD
+                ),
+                default = 0,
+            )
+
+            if 'INTERNAL_VOLTAGE_SCALING' in self.pinned:
+                return highest_frequency <= self('INTERNAL_VOLTAGE_SCALING_TABLE')[self('INTERNAL_VOLTAGE_SCALING')]
+
+
+
+            # The lowest voltage scaling that the clock tree fits in saves the
+            # most power, but the lower voltage scalings also need more flash
+            # wait-states for the same AXI/AHB frequency (e.g. 32MHz needs one
+            # wait-state at VOS3 and VOS2, but none at VOS1 and VOS0). So the
+            # target can instead prefer the lowest voltage scaling that still
+            # gets away with the fewest wait-states (see `parameterize_flash`).
+
+            if self('INTERNAL_VOLTAGE_SCALING_PREFERENCE') == 'FLASH_LATENCY' and self('AXI_AHB_CK') is not TBD:
+
+                def latency(voltage_scaling):
+                    return sum(
+                        self('AXI_AHB_CK') > maximum_frequency
+                        for maximum_frequency in self('FLASH_LATENCY_TABLE')[voltage_scaling]
                     )
-                    for unit in self('APBS')
+
+                fitting = sorted(
+                    (
+                        voltage_scaling
+                        for voltage_scaling in MCUS[self.mcu]['INTERNAL_VOLTAGE_SCALING'].constraint.iterate()
+                        if highest_frequency <= self('INTERNAL_VOLTAGE_SCALING_TABLE')[voltage_scaling]
+                    ),
+                    key = latency,
+                )
+
+                return any(
+                    checkout('INTERNAL_VOLTAGE_SCALING', voltage_scaling)
+                    for voltage_scaling in fitting
                 )
 
-                if not every_apb_satisfied:
-                    continue
+            return any(
+                highest_frequency <= self('INTERNAL_VOLTAGE_SCALING_TABLE')[voltage_scaling]
+                for voltage_scaling in each('INTERNAL_VOLTAGE_SCALING')
+            )
+
+
+
+        ################################################################################
+        #
+        # Flash.
+        #
+        # The amount of wait-states needed to read from the flash
+        # depends on how fast the AXI/AHB bus is and the internal
+        # voltage; every extra wait-state is a cycle lost on each
+        # instruction fetch that misses the cache, so we go with the
+        # fewest that'd be safe.
+        #
+
+
+
+        @bruteforce
+        def parameterize_flash():
+
+            if self('AXI_AHB_CK') is TBD:
+                return False
+
+            maximum_frequencies = self('FLASH_LATENCY_TABLE')[self('INTERNAL_VOLTAGE_SCALING')]
+
+            for latency, maximum_frequency in enumerate(maximum_frequencies):
+                if self('AXI_AHB_CK') <= maximum_frequency:
+                    break
+            else:
+                return False
+
+            return (
+                checkout('FLASH_LATENCY'          , latency                                     ) and
+                checkout('FLASH_PROGRAMMING_DELAY', self('FLASH_PROGRAMMING_DELAY_TABLE')[latency])
+            )
+
+
+
+        ################################################################################
+        #
+        # Everything after this point only reads the clock tree
+        # and writes to its own keys, so if there are workers to
+        # spare (and processes can be forked on this platform),
+        # the solvers are deferred to be ran concurrently.
+        #
 
 
 
-                return True
+        if (
+            self.solver_workers is not None and
+            self.solver_workers > 1 and
+            'fork' in multiprocessing.get_all_start_methods()
+        ):
+            deferred_solvers = []
 
 
 
@@ -1015,26 +2535,56 @@ class Parameterization:
         # UXARTs.
         # TODO Consider maximum kernel frequency.
         #
+        # The kernel clock goes through the prescaler and then
+        # the baud divider (USARTDIV); with oversampling by 8, the
+        # receiver is less tolerant to clock deviation, but the
+        # baud can go twice as high for the same kernel clock:
+        # >
+        # >    baud = (16 / oversampling) * (kernel / PRESC) / USARTDIV
+        # >
+        # Oversampling by 16 without any prescaling is what's tried first
+        # across every kernel source; the prescaler is only brought in when
+        # none of them work out, and oversampling by 8 only after that
+        # (and then only for the instances that actually need it). This way,
+        # a configuration that can be done without them is left alone.
+        # For oversampling by 8, the lowest four bits of USARTDIV are
+        # shifted down by one in BRR.
+        #
 
 
 
-        for instances in self('UXARTS', when_undefined = ()):
+        def parameterize_uxarts(instances):
 
-            @bruteforce
-            def parameterize_uxarts():
 
 
+            # Check if any of the instances are even used.
 
-                # Check if any of the instances are even used.
+            used_instances = [
+                (peripheral, unit)
+                for peripheral, unit in instances
+                if self(f'{peripheral}{unit}_BAUD') is not TBD
+            ]
 
-                used_instances = [
-                    (peripheral, unit)
-                    for peripheral, unit in instances
-                    if self(f'{peripheral}{unit}_BAUD') is not TBD
-                ]
+            if not used_instances:
+                return True
 
-                if not used_instances:
-                    return True
+
+
+            # Each tier is the oversamplings (in order of preference)
+            # and the prescalers that the instances are allowed to use.
+
+            peripheral, unit = used_instances[0]
+
+            oversamplings = tuple(MCUS[self.mcu][f'{peripheral}{unit}_OVERSAMPLING'].constraint.iterate())
+            prescalers    = tuple(MCUS[self.mcu][f'{peripheral}{unit}_PRESC'       ].constraint.iterate())
+
+            tiers = (
+                ((16,)        , (1,)      ),
+                ((16,)        , prescalers),
+                (oversamplings, prescalers),
+            )
+
+            for tier_oversamplings, tier_prescalers in tiers:
 
 
 
@@ -1043,32 +2593,90 @@ class Parameterization:
 
                 for kernel_source in each(f'UXART_{instances}_KERNEL_SOURCE'):
 
-                    if self(kernel_source) is TBD:
+                    kernel_frequency = self(kernel_source)
+
+                    if kernel_frequency is TBD:
                         continue
 
 
 
-                    every_instance_satisfied = True
+                    bests = {}
 
                     for peripheral, unit in used_instances:
 
-                        baud_divider = round(self(kernel_source) / self(f'{peripheral}{unit}_BAUD'))
+                        needed_baud = self(f'{peripheral}{unit}_BAUD')
+                        tolerance   = self(f'{peripheral}{unit}_BAUD_TOLERANCE')
 
-                        if not checkout(f'{peripheral}{unit}_BAUD_DIVIDER', baud_divider):
-                            every_instance_satisfied = False
-                            break
+                        if tolerance is TBD:
+                            tolerance = 0.005 # TODO Arbitrary error threshold.
+
+
+
+                        # Find the prescaler and baud divider with the least error.
+
+                        best = None
+
+                        for oversampling in tier_oversamplings:
+
+                            for presc in tier_prescalers:
+
+                                # With oversampling by 8, the lowest bit of USARTDIV
+                                # doesn't make it into BRR, so it has to be even.
+
+                                if oversampling == 8:
+                                    baud_divider = 2 * round(kernel_frequency / presc * (16 / oversampling) / needed_baud / 2)
+                                else:
+                                    baud_divider = round(kernel_frequency / presc * (16 / oversampling) / needed_baud)
+
+                                if not MCUS[self.mcu][f'{peripheral}{unit}_BAUD_DIVIDER'].constraint.check(baud_divider):
+                                    continue
 
-                        actual_baud  = self(kernel_source) / baud_divider
-                        actual_error = abs(1 - actual_baud / self(f'{peripheral}{unit}_BAUD'))
+                                actual_baud  = kernel_frequency / presc * (16 / oversampling) / baud_divider
+                                actual_error = abs(1 - actual_baud / needed_baud)
 
-                        if actual_error > 0.005: # TODO Arbitrary error threshold.
-                            every_instance_satisfied = False
+                                if best is None or actual_error < best.error:
+                                    best = types.SimpleNamespace(
+                                        oversampling = oversampling,
+                                        presc        = presc,
+                                        baud_divider = baud_divider,
+                                        error        = actual_error,
+                                    )
+
+                            if best is not None and best.error <= tolerance:
+                                break
+
+
+
+                        if best is None or best.error > tolerance:
                             break
 
+                        bests[(peripheral, unit)] = best
+
+
+
+                    # Every instance has to be satisfied by the same kernel source.
+
+                    if len(bests) != len(used_instances):
+                        continue
+
+                    for (peripheral, unit), best in bests.items():
+
+                        if best.oversampling == 8:
+                            baud_divider = (best.baud_divider & ~0b1111) | ((best.baud_divider & 0b1111) >> 1)
+                        else:
+                            baud_divider = best.baud_divider
+
+                        self[f'{peripheral}{unit}_OVERSAMPLING'] = best.oversampling
+                        self[f'{peripheral}{unit}_PRESC'       ] = best.presc
+                        self[f'{peripheral}{unit}_BAUD_DIVIDER'] = baud_divider
+                        self[f'{peripheral}{unit}_BAUD_ERROR'  ] = best.error
+
+                    return True
 
 
-                    if every_instance_satisfied:
-                        return True
+
+        for instances in self('UXARTS', when_undefined = ()):
+            bruteforce(parameterize_uxarts, instances)
 
 
 
@@ -1077,98 +2685,216 @@ class Parameterization:
         # I2Cs.
         # TODO Consider maximum kernel frequency.
         #
+        # Rather than searching for the SCL high and low periods, they're
+        # computed directly for each prescaler from the I2C-bus specification
+        # of the mode that the baud falls under. With tPRESC = (PRESC + 1) * tI2CCLK:
+        # >
+        # >    tLOW  = tAF + 2 * tI2CCLK + (SCLL + 1) * tPRESC >= tLOW(min)
+        # >    tHIGH = tAF + 2 * tI2CCLK + (SCLH + 1) * tPRESC >= tHIGH(min)
+        # >    tSCL  = tf + tr + 2 * (tAF + 2 * tI2CCLK) + (SCLL + 1 + SCLH + 1) * tPRESC
+        # >
+        # The fewest amount of ticks that doesn't make SCL faster than the
+        # needed baud is used, and the ticks are split between the low and
+        # high periods in proportion to the specification's minimums (so
+        # the periods are asymmetric, which is what lets Fast-mode Plus
+        # actually get to 1MHz). The data hold and setup times are ensured
+        # by the SDA and SCL delays:
+        # >
+        # >    SDADEL * tPRESC       >= tf(max) + tHD;DAT(min) - tAF(min) - 3 * tI2CCLK
+        # >    SDADEL * tPRESC       <= tVD;DAT(max)           - tAF(max) - 4 * tI2CCLK
+        # >    (SCLDEL + 1) * tPRESC >= tr(max) + tSU;DAT(min)
+        # >
+        # The rise and fall times of the bus can be given; otherwise, the
+        # maximums allowed by the mode are assumed. The digital filter isn't
+        # used, so it doesn't factor in.
+        #
 
 
 
-        for unit in self('I2CS', when_undefined = ()):
+        # The maximum baud of the mode, the minimum SCL low and high periods,
+        # the minimum data setup time, the maximum data valid time, and the
+        # maximum rise and fall times.
 
+        i2c_modes = (
+            (  100_000, 4.7e-6, 4.0e-6 , 250e-9, 3.45e-6, 1000e-9, 300e-9), # Standard-mode.
+            (  400_000, 1.3e-6, 0.6e-6 , 100e-9, 0.9e-6 , 300e-9 , 300e-9), # Fast-mode.
+            (1_000_000, 0.5e-6, 0.26e-6, 50e-9 , 0.45e-6, 120e-9 , 120e-9), # Fast-mode Plus.
+        )
 
 
-            @bruteforce
-            def parameterize_i2c():
 
+        def parameterize_i2c(unit):
 
 
-                # See if the unit is even used.
 
-                needed_baud = self(f'I2C{unit}_BAUD')
+            # See if the unit is even used.
 
-                if needed_baud is TBD:
-                    return True
+            needed_baud = self(f'I2C{unit}_BAUD')
+
+            if needed_baud is TBD:
+                return True
 
 
 
-                # We can't get an exact baud-rate for I2C (since there's a lot
-                # of factors involved anyways like clock-stretching), we'll have
-                # to try every single possibility and find the one with the least
-                # amount of error.
+            # Determine the timings we'll need to meet.
 
-                best = None
+            for mode in i2c_modes:
+                if needed_baud <= mode[0]:
+                    break
+            else:
+                return False
 
-                def keep_best(*, kernel_source, presc, scl, baud, timeouta):
+            _, low_min, high_min, setup_min, valid_max, rise_max, fall_max = mode
 
-                    nonlocal best
+            rise_time = self(f'I2C{unit}_RISE_TIME')
+            fall_time = self(f'I2C{unit}_FALL_TIME')
 
-                    if (
-                        best is None or
-                        abs(needed_baud - baud) < abs(needed_baud - best.baud)
-                    ):
-                        best = types.SimpleNamespace(
-                            kernel_source = kernel_source,
-                            presc         = presc,
-                            scl           = scl,
-                            baud          = baud,
-                            timeouta      = timeouta,
-                        )
+            if rise_time is TBD:
+                rise_time = rise_max
 
+            if fall_time is TBD:
+                fall_time = fall_max
 
+            filter_min, filter_max = self('I2C_ANALOG_FILTER_DELAY')
 
-                # Find the best approximation.
 
-                for kernel_source in each(f'I2C{unit}_KERNEL_SOURCE'):
 
-                    kernel_frequency = self(kernel_source)
+            # We'll go with whatever gets the closest to the desired baud.
 
-                    if kernel_frequency is TBD:
+            best = None
+
+            def keep_best(*, kernel_source, presc, sclh, scll, scldel, sdadel, baud, timeouta):
+
+                nonlocal best
+
+                if (
+                    best is None or
+                    abs(needed_baud - baud) < abs(needed_baud - best.baud)
+                ):
+                    best = types.SimpleNamespace(
+                        kernel_source = kernel_source,
+                        presc         = presc,
+                        sclh          = sclh,
+                        scll          = scll,
+                        scldel        = scldel,
+                        sdadel        = sdadel,
+                        baud          = baud,
+                        timeouta      = timeouta,
+                    )
+
+
+
+            for kernel_source in each(f'I2C{unit}_KERNEL_SOURCE'):
+
+                kernel_frequency = self(kernel_source)
+
+                if kernel_frequency is TBD or not kernel_frequency:
+                    continue
+
+                clock_period = 1 / kernel_frequency
+
+
+
+                # The kernel clock has to be fast enough for the SCL edges to be detected.
+
+                if not (clock_period < (low_min - filter_min) / 4 and clock_period < high_min):
+                    continue
+
+                timeouta = round(self(f'I2C{unit}_TIMEOUT') * kernel_frequency / 2048 - 1)
+
+                if not MCUS[self.mcu][f'I2C{unit}_TIMEOUTR_TIMEOUTA'].constraint.check(timeouta):
+                    continue
+
+
+
+                for presc in each(f'I2C{unit}_PRESC'):
+
+                    tick = (presc + 1) * clock_period
+
+
+
+                    # Data hold and setup times.
+                    # The timings often land exactly on a multiple of the tick, so
+                    # a bit of slack is given to keep floating-point rounding from
+                    # bumping the amount of ticks up by one.
+
+                    sdadel = max(0, math.ceil((fall_time - filter_min - 3 * clock_period) / tick - 1e-9))
+                    scldel = max(0, math.ceil((rise_time + setup_min) / tick - 1e-9) - 1)
+
+                    if sdadel > (valid_max - filter_max - 4 * clock_period) / tick + 1e-9:
                         continue
 
-                    timeouta = round(self(f'I2C{unit}_TIMEOUT') * kernel_frequency / 2048 - 1)
+                    if not MCUS[self.mcu][f'I2C{unit}_SDADEL'].constraint.check(sdadel):
+                        continue
 
-                    if not MCUS[self.mcu][f'I2C{unit}_TIMEOUTR_TIMEOUTA'].constraint.check(timeouta):
+                    if not MCUS[self.mcu][f'I2C{unit}_SCLDEL'].constraint.check(scldel):
                         continue
 
-                    for presc in each(f'I2C{unit}_PRESC'):
 
-                        scl = round(kernel_frequency / (presc + 1) / needed_baud / 2)
 
-                        if not MCUS[self.mcu][f'I2C{unit}_SCLH'].constraint.check(scl):
-                            continue
+                    # The SCL low period also has to have enough
+                    # room for the SDA and SCL delays to happen.
 
-                        if not MCUS[self.mcu][f'I2C{unit}_SCLL'].constraint.check(scl):
-                            continue
+                    synchronization = filter_min + 2 * clock_period
+                    edges           = fall_time + rise_time + 2 * synchronization
 
-                        keep_best(
-                            kernel_source = kernel_source,
-                            presc         = presc,
-                            scl           = scl,
-                            baud          = kernel_frequency / (scl * 2 * (presc + 1) + 1),
-                            timeouta      = timeouta,
-                        )
+                    low_ticks_min  = max(1, math.ceil((low_min  - synchronization) / tick - 1e-9), sdadel + scldel + 2)
+                    high_ticks_min = max(1, math.ceil((high_min - synchronization) / tick - 1e-9))
 
 
 
-                # See if we got it.
+                    # Split the SCL period up.
+
+                    ticks = max(
+                        low_ticks_min + high_ticks_min,
+                        math.ceil((1 / needed_baud - edges) / tick - 1e-9)
+                    )
+
+                    low_ticks  = max(low_ticks_min, round(ticks * low_min / (low_min + high_min)))
+                    high_ticks = ticks - low_ticks
+
+                    if high_ticks < high_ticks_min:
+                        high_ticks = high_ticks_min
+                        low_ticks  = ticks - high_ticks
+
+                    if not MCUS[self.mcu][f'I2C{unit}_SCLL'].constraint.check(low_ticks - 1):
+                        continue
+
+                    if not MCUS[self.mcu][f'I2C{unit}_SCLH'].constraint.check(high_ticks - 1):
+                        continue
+
+                    keep_best(
+                        kernel_source = kernel_source,
+                        presc         = presc,
+                        sclh          = high_ticks - 1,
+                        scll          = low_ticks  - 1,
+                        scldel        = scldel,
+                        sdadel        = sdadel,
+                        baud          = 1 / (edges + ticks * tick),
+                        timeouta      = timeouta,
+                    )
+
+
+
+            # See if we got it.
+
+            success = best is not None and abs(1 - best.baud / needed_baud) < 0.01 # TODO Ad-hoc tolerance.
+
+            if success:
+                self[f'I2C{unit}_KERNEL_SOURCE'    ] = best.kernel_source
+                self[f'I2C{unit}_PRESC'            ] = best.presc
+                self[f'I2C{unit}_SCLH'             ] = best.sclh
+                self[f'I2C{unit}_SCLL'             ] = best.scll
+                self[f'I2C{unit}_SCLDEL'           ] = best.scldel
+                self[f'I2C{unit}_SDADEL'           ] = best.sdadel
+                self[f'I2C{unit}_TIMEOUTR_TIMEOUTA'] = best.timeouta
+
+            return success
 
-                success = best is not None and abs(1 - best.baud / needed_baud) < 0.01 # TODO Ad-hoc tolerance.
 
-                if success:
-                    self[f'I2C{unit}_KERNEL_SOURCE'    ] = best.kernel_source
-                    self[f'I2C{unit}_PRESC'            ] = best.presc
-                    self[f'I2C{unit}_SCLH'             ] = best.scl
-                    self[f'I2C{unit}_SCLL'             ] = best.scl
-                    self[f'I2C{unit}_TIMEOUTR_TIMEOUTA'] = best.timeouta
 
-                return success
+        for unit in self('I2CS', when_undefined = ()):
+            bruteforce(parameterize_i2c, unit)
 
 
 
@@ -1179,6 +2905,108 @@ class Parameterization:
 
 
 
+        #
+        # Scanning every divider (up to 2^16 of them) for every timer and for
+        # every global timer prescaler setting adds up fast, but the only
+        # dividers worth trying are the ones near where the math works out.
+        #
+        # If a specific counter rate is needed, then the divider must be
+        # exactly `K / counter_rate`, so only the neighboring integers need
+        # to be checked.
+        #
+        # Otherwise, the ideal ratio is `R = K / update_rate = divider * modulation`.
+        # For a given modulation M, the only dividers that round to it
+        # are within `R / (M + 1/2) ... R / (M - 1/2)`, and the only ones that
+        # are within the tolerance are within `R / (M * (1 + tol)) ... R / (M * (1 - tol))`.
+        # The intervals for each modulation are disjoint and get higher as the
+        # modulation gets lower, so going through the modulations from highest
+        # to lowest yields the dividers in ascending order. The intervals are
+        # widened a little so no divider is missed due to rounding errors; the
+        # caller still does the exact check, so the divider that ends up being
+        # chosen is the same one that a scan from 1 upwards would've found.
+        #
+
+
+
+        def each_timer_divider(unit, kernel_frequency, needed_counter_rate, needed_update_rate):
+
+            dividers    = MCUS[self.mcu][f'TIM{unit}_DIVIDER'   ].constraint
+            modulations = MCUS[self.mcu][f'TIM{unit}_MODULATION'].constraint
+            slack       = 1e-9
+
+
+
+            # The counter rate pins down the divider.
+
+            if needed_counter_rate is not TBD:
+
+                ideal_divider = kernel_frequency / needed_counter_rate
+
+                yield from range(
+                    max(dividers.minimum, math.floor(ideal_divider) - 1),
+                    min(dividers.maximum, math.ceil (ideal_divider) + 1) + 1
+                )
+
+                return
+
+
+
+            # Any divider lower than this would need
+            # a modulation value that's too large.
+
+            ratio     = kernel_frequency / needed_update_rate
+            tolerance = self(f'TIM{unit}_MAX_UPDATE_RATE_ERROR')
+
+            lowest_divider = max(dividers.minimum, math.floor(ratio / (modulations.maximum + 1/2) * (1 - slack)))
+
+
+
+            # Go through each modulation that could be rounded to,
+            # unless there's fewer dividers to go through instead.
+
+            highest_modulation = min(modulations.maximum, math.ceil (ratio / lowest_divider    * (1 + slack)) + 1)
+            lowest_modulation  = max(modulations.minimum, math.floor(ratio / dividers.maximum * (1 - slack)) - 1)
+
+            if highest_modulation - lowest_modulation > dividers.maximum - lowest_divider:
+
+                for divider in range(lowest_divider, dividers.maximum + 1):
+
+                    counter_rate = kernel_frequency / divider
+                    modulation   = round(counter_rate / needed_update_rate)
+
+                    if not modulations.check(modulation):
+                        continue
+
+                    if abs(1 - counter_rate / modulation / needed_update_rate) <= tolerance:
+                        yield divider
+
+                return
+
+            for modulation in range(highest_modulation, lowest_modulation - 1, -1):
+
+                lower = max(
+                    ratio / (modulation + 1/2),
+                    ratio / (modulation * (1 + tolerance)),
+                )
+
+                upper = min(
+                    ratio / (modulation - 1/2),
+                    ratio / (modulation * (1 - tolerance)) if tolerance < 1 else math.inf,
+                )
+
+                yield from range(
+                    max(dividers.minimum, math.ceil (lower * (1 - slack))),
+                    min(dividers.maximum, math.floor(upper * (1 + slack))) + 1
+                )
+
+
+
+        #
+        #
+        #
+
+
+
         def parameterize_timer(unit):
 
             needed_counter_rate = self(f'TIM{unit}_COUNTER_RATE')
@@ -1215,7 +3043,13 @@ class Parameterization:
             # Find the pair of divider and modulation values to
             # get an output frequency that's within tolerance.
 
-            for divider in each(f'TIM{unit}_DIVIDER'):
+            divider_handle    = resolve(f'TIM{unit}_DIVIDER'              )
+            modulation_handle = resolve(f'TIM{unit}_MODULATION'           )
+            tolerance         = self   (f'TIM{unit}_MAX_UPDATE_RATE_ERROR')
+
+            for divider in steer(divider_handle, each_timer_divider(unit, kernel_frequency, needed_counter_rate, needed_update_rate)):
+
+                self[divider_handle] = divider
 
                 counter_rate = kernel_frequency / divider
 
@@ -1239,7 +3073,7 @@ class Parameterization:
                 # Determine the modulation value.
 
                 if not checkout(
-                    f'TIM{unit}_MODULATION',
+                    modulation_handle,
                     round(counter_rate / needed_update_rate)
                 ):
                     continue
@@ -1248,10 +3082,10 @@ class Parameterization:
 
                 # See if things are within tolerance.
 
-                actual_update_rate = counter_rate / self(f'TIM{unit}_MODULATION')
+                actual_update_rate = counter_rate / self(modulation_handle)
                 actual_error       = abs(1 - actual_update_rate / needed_update_rate)
 
-                if actual_error <= self(f'TIM{unit}_MAX_UPDATE_RATE_ERROR'):
+                if actual_error <= tolerance:
                     return True
 
 
@@ -1279,10 +3113,10 @@ class Parameterization:
 
             for _ in each('GLOBAL_TIMER_PRESCALER'):
 
-                every_unit_satisfied = all(
+                every_unit_satisfied = attempt(lambda: all(
                     parameterize_timer(unit)
                     for unit in used_units
-                )
+                ))
 
                 if every_unit_satisfied:
                     return True
@@ -1296,93 +3130,92 @@ class Parameterization:
 
 
 
-        for unit in self('SPIS', when_undefined = ()):
-
+        def parameterize_spi(unit):
 
 
 
-            @bruteforce
-            def parameterize_spi():
+            # See if the unit is even used.
 
+            needed_baud = self(f'SPI{unit}_BAUD')
 
+            if needed_baud is TBD:
+                return True
 
-                # See if the unit is even used.
 
-                needed_baud = self(f'SPI{unit}_BAUD')
 
-                if needed_baud is TBD:
-                    return True
+            # We'll approximate for the desired baud.
 
+            best = None
 
+            def keep_best(*, kernel_source, bypass_divider, divider, baud):
 
-                # We'll approximate for the desired baud.
+                nonlocal best
 
-                best = None
+                if (
+                    best is None or
+                    abs(needed_baud - baud) < abs(needed_baud - best.baud)
+                ):
+                    best = types.SimpleNamespace(
+                        kernel_source  = kernel_source,
+                        bypass_divider = bypass_divider,
+                        divider        = divider,
+                        baud           = baud,
+                    )
 
-                def keep_best(*, kernel_source, bypass_divider, divider, baud):
 
-                    nonlocal best
 
-                    if (
-                        best is None or
-                        abs(needed_baud - baud) < abs(needed_baud - best.baud)
-                    ):
-                        best = types.SimpleNamespace(
-                            kernel_source  = kernel_source,
-                            bypass_divider = bypass_divider,
-                            divider        = divider,
-                            baud           = baud,
-                        )
+            # Determine the kernel frequency to use.
 
+            for kernel_source in each(f'SPI{unit}_KERNEL_SOURCE'):
 
+                kernel_frequency = self(kernel_source)
 
-                # Determine the kernel frequency to use.
+                if kernel_frequency is TBD:
+                    continue
 
-                for kernel_source in each(f'SPI{unit}_KERNEL_SOURCE'):
 
-                    kernel_frequency = self(kernel_source)
 
-                    if kernel_frequency is TBD:
-                        continue
+                # See whether or not we need the divider.
 
+                for bypass_divider in each(f'SPI{unit}_BYPASS_DIVIDER'):
 
+                    if bypass_divider:
 
-                    # See whether or not we need the divider.
+                        keep_best(
+                            kernel_source  = kernel_source,
+                            bypass_divider = bypass_divider,
+                            divider        = divider,
+                            baud           = kernel_frequency,
+                        )
 
-                    for bypass_divider in each(f'SPI{unit}_BYPASS_DIVIDER'):
+                    else:
 
-                        if bypass_divider:
+                        for divider in each(f'SPI{unit}_DIVIDER'):
 
                             keep_best(
                                 kernel_source  = kernel_source,
                                 bypass_divider = bypass_divider,
                                 divider        = divider,
-                                baud           = kernel_frequency,
+                                baud           = kernel_frequency / divider,
                             )
 
-                        else:
 
-                            for divider in each(f'SPI{unit}_DIVIDER'):
 
-                                keep_best(
-                                    kernel_source  = kernel_source,
-                                    bypass_divider = bypass_divider,
-                                    divider        = divider,
-                                    baud           = kernel_frequency / divider,
-                                )
+            # See if we got it.
 
+            success = best is not None and abs(1 - best.baud / needed_baud) < 0.01 # TODO Ad-hoc tolerance.
 
+            if success:
+                self[f'SPI{unit}_KERNEL_SOURCE' ] = best.kernel_source
+                self[f'SPI{unit}_BYPASS_DIVIDER'] = best.bypass_divider
+                self[f'SPI{unit}_DIVIDER'       ] = best.divider
 
-                # See if we got it.
+            return success
 
-                success = best is not None and abs(1 - best.baud / needed_baud) < 0.01 # TODO Ad-hoc tolerance.
 
-                if success:
-                    self[f'SPI{unit}_KERNEL_SOURCE' ] = best.kernel_source
-                    self[f'SPI{unit}_BYPASS_DIVIDER'] = best.bypass_divider
-                    self[f'SPI{unit}_DIVIDER'       ] = best.divider
 
-                return success
+        for unit in self('SPIS', when_undefined = ()):
+            bruteforce(parameterize_spi, unit)
 
 
 
@@ -1495,10 +3328,56 @@ class Parameterization:
 
 
         ################################################################################
+        #
+        # Merge in the results of the deferred solvers, if any, in the
+        # order they would've been ran. None of them should be writing
+        # to the same keys, since otherwise the result would depend on
+        # the order that they were ran in.
+        #
+
+
+
+        if deferred_solvers:
+
+            written = set()
+
+            for changes, removals, footprints, stats in run_solvers_concurrently(self, deferred_solvers, self.solver_workers):
+
+                if overlap := written & (changes.keys() | set(removals)):
+
+                    raise RuntimeError(
+                        f'For target {repr(self.target)} ({repr(self.mcu)}), '
+                        f'multiple peripheral solvers wrote to the same keys: '
+                        f'{repr([MCUS[self.mcu].keys[handle] for handle in sorted(overlap)])}.'
+                    )
+
+                written |= changes.keys() | set(removals)
+
+                for handle in removals:
+                    del self.determined.changes[handle]
+
+                self.determined.changes |= changes
+                self.footprints         |= footprints
+
+                if self.stats is not None:
+                    self.stats |= {
+                        identity : tally
+                        for identity, tally in stats.items()
+                        if identity in footprints
+                    }
+
+
+
+        ################################################################################
+
+
 
+        # Only the keys that were written to or are predefined
+        # could have a value; everything else is still TBD.
 
+        for handle in (*self.determined.changes, *MCUS[self.mcu].predefined):
 
-        for key, value in self.determined.items():
+            value = self(handle)
 
             if value is TBD:
                 continue
@@ -1513,8 +3392,8 @@ class Parameterization:
 
             if isinstance(value, float) and value.is_integer():
 
-                value                = int(value)
-                self.determined[key] = value
+                value                           = int(value)
+                self.determined.changes[handle] = value
 
 
 
@@ -1522,9 +3401,138 @@ class Parameterization:
             # to the actual underlying value to be used in the
             # generated code (e.g. the binary code).
 
-            constraint = MCUS[self.mcu][key].constraint
+            constraint = MCUS[self.mcu].entries[handle].constraint
 
             if not isinstance(constraint, Mapping):
                 continue
 
-            self.determined[key] = constraint.dictionary[value]
+            self.determined.changes[handle] = constraint.dictionary[value]
+
+
+
+        # Dump the statistics of each solver, if asked to.
+
+        if stats_path is not None:
+            pathlib.Path(stats_path).write_text(json.dumps(
+                [
+                    {
+                        'solver'     : identity[0],
+                        'arguments'  : identity[1:],
+                        'seconds'    : tally.seconds,
+                        'candidates' : tally.candidates,
+                        'accepted'   : tally.accepted,
+                        'rejected'   : tally.rejected,
+                        'replayed'   : tally.replayed,
+                    }
+                    for identity, tally in self.stats.items()
+                ],
+                indent = 4,
+            ) + '\n')
+
+
+
+        # Save the footprints for the next build, if asked to;
+        # no need to if everything came from the lockfile anyways.
+
+        if lockfile is not None and not (
+            locked is not None and
+            self.pinned.additions == locked.pinned.additions and
+            self.footprints.keys() == locked.footprints.keys() and
+            all(footprint is locked.footprints[identity] for identity, footprint in self.footprints.items())
+        ):
+            write_lockfile(lockfile, self)
+
+
+
+################################################################################
+#
+# Builds that generate code for lots of boards can parameterize all of
+# the targets at once. Each target is given as a tuple of the arguments
+# to `Parameterization` (target, MCU, schema, GPIOs, interrupts), and
+# the keyword options are passed along to every one of them.
+#
+# The targets are spread across a pool of worker processes; each worker
+# keeps the MCUs it has loaded around (as well as its PLL cache) for the
+# next target that needs it. The MCUs used by the batch are loaded before
+# the pool is made, so workers that are forked off won't have to load them.
+#
+# The results are yielded as they come in, which isn't necessarily the
+# order the targets were given in. A target that fails to parameterize
+# doesn't stop the rest of the batch; its error is given back instead.
+#
+
+
+
+def parameterize_target(index, arguments, options):
+
+    try:
+        return index, Parameterization(*arguments, **options), None
+    except Exception as error:
+        return index, None, error
+
+
+
+def load_mcus(names):
+    for name in names:
+        MCUS[name]
+
+
+
+def parameterize_batch(targets, *, workers = None, **options):
+
+    targets = list(targets)
+    names   = sorted({ mcu for target, mcu, *_ in targets if mcu in MCUS })
+
+    def result(index, parameterization, error):
+        return types.SimpleNamespace(
+            index            = index,
+            target           = targets[index][0],
+            mcu              = targets[index][1],
+            parameterization = parameterization,
+            error            = error,
+        )
+
+
+
+    # No need for a pool when there's only going to be one worker.
+
+    if workers == 1:
+
+        for index, arguments in enumerate(targets):
+            yield result(*parameterize_target(index, arguments, options))
+
+        return
+
+
+
+    load_mcus(names)
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers = workers,
+        initializer = load_mcus,
+        initargs    = (names,),
+    ) as executor:
+
+        futures = {
+            executor.submit(parameterize_target, index, arguments, options) : index
+            for index, arguments in enumerate(targets)
+        }
+
+        try:
+
+            for future in concurrent.futures.as_completed(futures):
+
+                try:
+                    index, parameterization, error = future.result()
+                except Exception as pool_error: # e.g. The worker died or the result couldn't be pickled.
+                    index, parameterization, error = futures[future], None, pool_error
+
+                yield result(index, parameterization, error)
+
+
+
+        # If the caller stopped early, the targets
+        # that haven't been started yet are dropped.
+
+        finally:
+            executor.shutdown(cancel_futures = True)
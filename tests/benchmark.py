@@ -0,0 +1,159 @@
+import sys, timeit, types, tempfile, pathlib, importlib
+
+
+
+################################################################################
+#
+# Timings for the things that were done for the sake of performance,
+# so that the numbers can be reproduced (e.g. `python tests/benchmark.py`).
+# Everything is reported as the best of a few runs, since the machine
+# this is ran on is probably doing other stuff too.
+#
+# The package is imported the same way as in the tests
+# (see `test_lockfile.py`).
+#
+
+
+
+directory = tempfile.TemporaryDirectory()
+
+pathlib.Path(directory.name, 'deps').mkdir()
+pathlib.Path(directory.name, 'deps', 'stpy').symlink_to(pathlib.Path(__file__).resolve().parent.parent, target_is_directory = True)
+sys.path.insert(0, directory.name)
+
+mcus             = importlib.import_module('deps.stpy.mcus')
+parameterization = importlib.import_module('deps.stpy.parameterization')
+
+MCU_NAME = 'STM32H533RET6'
+
+
+
+def best(function, *, repeat = 10, number = 1):
+    return min(timeit.repeat(function, repeat = repeat, number = number)) / number
+
+
+
+def show(name, *columns):
+    print(f'    {name:32}', *(f'{column:>12}' for column in columns))
+
+
+
+################################################################################
+#
+# MCU databases; building one from the database script and pinout
+# CSV versus opening the compiled database that's kept around.
+#
+
+
+
+def benchmark_mcu_databases():
+
+    def build():
+        mcu      = mcus.MCU.__new__(mcus.MCU)
+        mcu.name = MCU_NAME
+        mcu.build()
+        mcu.index()
+
+    mcus.MCU(MCU_NAME) # Make sure the compiled database is up to date.
+
+    print(f'MCU databases ({MCU_NAME}), in ms:')
+    show('built from the sources'       , f'{best(build                       ) * 1e3:.1f}')
+    show('opened from the compiled file', f'{best(lambda: mcus.MCU(MCU_NAME)) * 1e3:.1f}')
+
+
+
+################################################################################
+#
+# Database entries; the slotted `Entry` records versus
+# the `types.SimpleNamespace` objects they replaced.
+#
+
+
+
+def benchmark_database_entries():
+
+    mcu      = mcus.MCU.__new__(mcus.MCU)
+    mcu.name = MCU_NAME
+    mcu.build()
+
+    fields  = ('clocktree', 'location', 'off_by_one', 'constraint', 'value')
+    entries = [entry for entry in mcu.database.values() if hasattr(entry, 'value')]
+
+    namespaces = [
+        types.SimpleNamespace(**{ field : getattr(entry, field) for field in fields })
+        for entry in entries
+    ]
+
+    def size(entry):
+        return sys.getsizeof(entry) + (sys.getsizeof(entry.__dict__) if hasattr(entry, '__dict__') else 0)
+
+    def loads(entries):
+        def load():
+            for entry in entries:
+                entry.constraint; entry.location; entry.off_by_one; entry.value
+        return best(load, repeat = 30, number = 10) / len(entries) * 1e9
+
+    print(f'Database entries ({len(entries)} that hold a value):')
+    show('', 'namespace', 'Entry')
+    show('bytes per entry', f'{sum(map(size, namespaces)) / len(entries):.0f}', f'{sum(map(size, entries)) / len(entries):.0f}')
+    show('ns per entry for four loads', f'{loads(namespaces):.0f}', f'{loads(entries):.0f}')
+
+
+
+################################################################################
+#
+# PLL search engines; the analytical solver (with the exhaustive
+# search as the fallback) versus evaluating the whole search space
+# with NumPy. The PLL cache is disabled so the search is actually done.
+#
+
+
+
+def benchmark_pll_engines():
+
+    try:
+        import numpy
+    except ImportError:
+        print('PLL search engines: skipped, NumPy is not installed.')
+        return
+
+    base = {
+        'HSI_ENABLE' : True,
+        'CPU_CK'     : 32_000_000,
+        'APB1_CK'    : 32_000_000,
+        'APB2_CK'    : 32_000_000,
+        'APB3_CK'    : 32_000_000,
+    }
+
+    plans = {
+        'typical PLL plan'            : { 'PLL1P_CK' : 250_000_000, 'PLL1Q_CK' : 125_000_000, 'PLL2P_CK' : 200_000_000, 'PLL2Q_CK' : 100_000_000, 'PLL3R_CK' : 80_000_000 },
+        'audio 12.288 MHz'            : { 'PLL2P_CK' : 12_288_000 },
+        'infeasible 12.288/49.152 MHz': { 'PLL2P_CK' : 12_288_000 , 'PLL2Q_CK' : 49_152_000 },
+        'infeasible 133/250 MHz'      : { 'PLL1P_CK' : 133_000_000, 'PLL1Q_CK' : 250_000_000 },
+        'non-integer 133.33 MHz'      : { 'PLL1P_CK' : 64_000_000 / 3 * 25 / 4 },
+    }
+
+    def parameterize(plan, engine):
+        try:
+            parameterization.Parameterization('benchmark', MCU_NAME, { **base, **plan }, (), (), pll_engine = engine, pll_cache = False)
+        except RuntimeError:
+            pass # The infeasible plans are supposed to fail.
+
+    print('PLL search engines, full parameterization in ms:')
+    show('', 'scalar', 'numpy')
+
+    for name, plan in plans.items():
+        show(name, *(
+            f'{best(lambda: parameterize(plan, engine), repeat = 5) * 1e3:.1f}'
+            for engine in ('scalar', 'numpy')
+        ))
+
+
+
+if __name__ == '__main__':
+
+    benchmark_mcu_databases()
+    print()
+    benchmark_database_entries()
+    print()
+    benchmark_pll_engines()
@@ -0,0 +1,80 @@
+import unittest, tempfile, pathlib, sys, importlib, sqlite3, contextlib
+
+
+
+# See `test_lockfile.py`.
+
+directory = tempfile.TemporaryDirectory()
+
+pathlib.Path(directory.name, 'deps').mkdir()
+pathlib.Path(directory.name, 'deps', 'stpy').symlink_to(pathlib.Path(__file__).resolve().parent.parent, target_is_directory = True)
+sys.path.insert(0, directory.name)
+
+mcus = importlib.import_module('deps.stpy.mcus')
+
+
+
+MCU_NAME = 'STM32H533RET6'
+
+
+
+# A compiled database that can't be read is supposed
+# to be treated as stale, so the MCU just gets rebuilt
+# (and recompiled) rather than anything crashing.
+
+class CompiledDatabaseTests(unittest.TestCase):
+
+
+
+    def setUp(self):
+
+        self.path     = pathlib.Path(mcus.__file__).parent.joinpath(f'databases/__pycache__/{MCU_NAME}.sqlite')
+        self.expected = mcus.MCU(MCU_NAME) # Also makes sure the compiled database is up to date.
+
+
+
+    def tamper(self, statement, *parameters):
+        with contextlib.closing(sqlite3.connect(self.path)) as connection:
+            connection.execute(statement, parameters)
+            connection.commit()
+
+
+
+    def assertRebuilt(self):
+
+        mcu = mcus.MCU(MCU_NAME)
+
+        self.assertNotIsInstance(mcu.database, mcus.CompiledDatabase)
+        self.assertEqual(mcu.keys       , self.expected.keys       )
+        self.assertEqual(mcu.holds_value, self.expected.holds_value)
+        self.assertEqual(mcu.predefined , self.expected.predefined )
+        self.assertEqual(mcu.clocktree  , self.expected.clocktree  )
+
+        self.assertIsInstance(mcus.MCU(MCU_NAME).database, mcus.CompiledDatabase)
+
+
+
+    def test_corrupted_metadata(self):
+        for field in ('digest', 'keys', 'translation', 'pins', 'summary'):
+            with self.subTest(field = field):
+                self.tamper('UPDATE metadata SET value = ? WHERE field = ?', b'\x80\x05garbage', field)
+                self.assertRebuilt()
+
+
+
+    def test_missing_metadata(self):
+        for field in ('digest', 'keys', 'translation', 'pins', 'summary'):
+            with self.subTest(field = field):
+                self.tamper('DELETE FROM metadata WHERE field = ?', field)
+                self.assertRebuilt()
+
+
+
+    def test_garbage_file(self):
+        self.path.write_bytes(b'not a database')
+        self.assertRebuilt()
+
+
+
+if __name__ == '__main__':
+    unittest.main()
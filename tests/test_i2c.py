@@ -0,0 +1,152 @@
+import unittest, tempfile, pathlib, sys, importlib
+
+
+
+# See `test_lockfile.py`.
+
+directory = tempfile.TemporaryDirectory()
+
+pathlib.Path(directory.name, 'deps').mkdir()
+pathlib.Path(directory.name, 'deps', 'stpy').symlink_to(pathlib.Path(__file__).resolve().parent.parent, target_is_directory = True)
+sys.path.insert(0, directory.name)
+
+parameterization = importlib.import_module('deps.stpy.parameterization')
+mcus             = importlib.import_module('deps.stpy.mcus')
+
+
+
+SCHEMA = {
+    'HSI_ENABLE'   : True,
+    'CPU_CK'       : 32_000_000,
+    'APB1_CK'      : 32_000_000,
+    'APB2_CK'      : 32_000_000,
+    'APB3_CK'      : 32_000_000,
+    'PLL3R_CK'     : 80_000_000,
+    'I2C1_TIMEOUT' : 0.01,
+}
+
+
+
+# The timing characteristics from UM10204 that the
+# SCL and SDA timings have to meet: the maximum SCL frequency,
+# the minimum SCL low and high periods, the minimum data setup time,
+# the minimum data hold time, the maximum data valid time, and
+# the maximum rise and fall times.
+
+MODES = {
+    'Sm'  : (  100_000, 4.7e-6, 4.0e-6 , 250e-9, 0, 3.45e-6, 1000e-9, 300e-9),
+    'Fm'  : (  400_000, 1.3e-6, 0.6e-6 , 100e-9, 0, 0.9e-6 , 300e-9 , 300e-9),
+    'Fm+' : (1_000_000, 0.5e-6, 0.26e-6, 50e-9 , 0, 0.45e-6, 120e-9 , 120e-9),
+}
+
+
+
+# What's expected to be computed for each mode with
+# the 80MHz kernel clock: PRESC, SCLL, SCLH, SCLDEL, SDADEL.
+
+EXPECTED = {
+    'Sm'  : (6, 52, 44, 14, 3),
+    'Fm'  : (1, 48, 20, 15, 9),
+    'Fm+' : (0, 33, 14, 13, 3),
+}
+
+
+
+class I2CTimingTests(unittest.TestCase):
+
+
+
+    def parameterize(self, baud):
+
+        result = parameterization.Parameterization(
+            'target',
+            'STM32H533RET6',
+            { **SCHEMA, 'I2C1_BAUD' : baud },
+            (),
+            (),
+            pll_cache = False,
+        )
+
+        sources = {
+            code : source
+            for source, code in mcus.MCUS['STM32H533RET6']['I2C1_KERNEL_SOURCE'].constraint.dictionary.items()
+        }
+
+        kernel_source = sources[result('I2C1_KERNEL_SOURCE')]
+
+        return result, kernel_source, tuple(
+            result(f'I2C1_{field}')
+            for field in ('PRESC', 'SCLL', 'SCLH', 'SCLDEL', 'SDADEL')
+        )
+
+
+
+    def test_timings(self):
+
+        for mode, (baud, low_min, high_min, setup_min, hold_min, valid_max, rise_max, fall_max) in MODES.items():
+            with self.subTest(mode = mode):
+
+                result, kernel_source, fields = self.parameterize(baud)
+
+                self.assertEqual(kernel_source, 'PLL3R_CK'   )
+                self.assertEqual(fields       , EXPECTED[mode])
+
+                presc, scll, sclh, scldel, sdadel = fields
+
+                filter_min, filter_max = result('I2C_ANALOG_FILTER_DELAY')
+                clock_period           = 1 / result('PLL3R_CK')
+                tick                   = (presc + 1) * clock_period
+                synchronization        = filter_min + 2 * clock_period
+                slack                  = 1e-12
+
+
+
+                # The SCL low and high periods.
+
+                low  = synchronization + (scll + 1) * tick
+                high = synchronization + (sclh + 1) * tick
+
+                self.assertGreaterEqual(low  + slack, low_min )
+                self.assertGreaterEqual(high + slack, high_min)
+
+
+
+                # The data setup time is what's left of the SCL delay after the SDA line rises,
+                # and the data hold time is the SDA delay after SCL falls.
+
+                setup = (scldel + 1) * tick - rise_max
+                hold  = sdadel * tick + filter_min + 3 * clock_period - fall_max
+                valid = sdadel * tick + filter_max + 4 * clock_period
+
+                self.assertGreaterEqual(setup + slack, setup_min)
+                self.assertGreaterEqual(hold  + slack, hold_min )
+                self.assertLessEqual   (valid - slack, valid_max)
+
+
+
+                # SCL can't be faster than the mode allows, nor far off the asked baud.
+
+                actual_baud = 1 / (rise_max + fall_max + low + high)
+
+                self.assertLessEqual(actual_baud * (1 - slack), baud)
+                self.assertLess(abs(1 - actual_baud / baud), 0.01)
+
+
+
+    # At 400KHz, the SCL low and high periods end up
+    # right on the minimums of Fast-mode (1.3us and 0.6us).
+
+    def test_fast_mode(self):
+
+        result, _, (presc, scll, sclh, _, _) = self.parameterize(400_000)
+
+        filter_min, _ = result('I2C_ANALOG_FILTER_DELAY')
+        clock_period  = 1 / result('PLL3R_CK')
+
+        self.assertAlmostEqual(filter_min + 2 * clock_period + (scll + 1) * (presc + 1) * clock_period, 1300e-9, delta = 1e-12)
+        self.assertAlmostEqual(filter_min + 2 * clock_period + (sclh + 1) * (presc + 1) * clock_period, 600e-9 , delta = 1e-12)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest, tempfile, pathlib, json, sys, importlib
+
+
+
+################################################################################
+#
+# The package uses relative imports that reach out of it (`..stpy`),
+# so it can only be imported as a subpackage of something else,
+# like how it'd be in a project as `deps/stpy`. For the tests,
+# it's just linked into a temporary directory and imported from there.
+#
+
+
+
+directory = tempfile.TemporaryDirectory()
+
+pathlib.Path(directory.name, 'deps').mkdir()
+pathlib.Path(directory.name, 'deps', 'stpy').symlink_to(pathlib.Path(__file__).resolve().parent.parent, target_is_directory = True)
+sys.path.insert(0, directory.name)
+
+parameterization = importlib.import_module('deps.stpy.parameterization')
+mcus             = importlib.import_module('deps.stpy.mcus')
+
+
+
+SCHEMA = {
+    'HSI_ENABLE'        : True,
+    'CSI_ENABLE'        : True,
+    'PLL1P_CK'          : 250_000_000,
+    'PLL2Q_CK'          : 100_000_000,
+    'CPU_CK'            : 250_000_000,
+    'APB1_CK'           : 250_000_000,
+    'APB2_CK'           : 250_000_000,
+    'APB3_CK'           : 250_000_000,
+    'USART2_BAUD'       : 115200,
+    'TIM2_UPDATE_RATE'  : 7,
+    'TIM6_COUNTER_RATE' : 1_000_000,
+    'TIM6_UPDATE_RATE'  : 100,
+}
+
+
+
+class LockfileTests(unittest.TestCase):
+
+
+
+    def setUp(self):
+        self.lockfile = pathlib.Path(directory.name, 'target.lock')
+        self.lockfile.unlink(missing_ok = True)
+
+
+
+    def parameterize(self, **options):
+
+        result = parameterization.Parameterization(
+            'target',
+            'STM32H533RET6',
+            dict(SCHEMA),
+            (),
+            (),
+            pll_cache     = False,
+            collect_stats = True,
+            **options
+        )
+
+        values = {
+            key : value
+            for key, value in result.determined.items()
+            if value is not mcus.TBD
+        }
+
+        return result, values
+
+
+
+    # Overwrite some of the solver outputs in the lockfile.
+
+    def tamper(self, edits):
+
+        lock = json.loads(self.lockfile.read_text())
+
+        for identity, inputs, outputs in lock['footprints']:
+            for output in outputs:
+                if output[0] in edits:
+                    output[1] = edits[output[0]](output[1])
+
+        self.lockfile.write_text(json.dumps(lock))
+
+
+
+    def test_untouched_lockfile_is_replayed(self):
+
+        _, fresh       = self.parameterize(lockfile = self.lockfile)
+        result, locked = self.parameterize(lockfile = self.lockfile)
+
+        self.assertEqual(locked, fresh)
+        self.assertTrue(all(stats.replayed for stats in result.stats.values()))
+
+
+
+    # Values that are still within the constraints but don't
+    # go together anymore should have the solver be ran again.
+
+    def test_tampered_lockfile_is_solved_again(self):
+
+        _, fresh = self.parameterize(lockfile = self.lockfile)
+
+        self.tamper({
+            'TIM2_DIVIDER'        : lambda divider : divider * 2,
+            'USART2_BAUD_DIVIDER' : lambda divider : 4000,
+            'PLL1_MULTIPLIER'     : lambda multiplier : multiplier + 1,
+        })
+
+        result, locked = self.parameterize(lockfile = self.lockfile)
+
+        self.assertEqual(locked, fresh)
+        self.assertFalse(result.stats[('parameterize_plls',)].replayed)
+        self.assertFalse(result.stats[('parameterize_timers',)].replayed)
+        self.assertFalse(result.stats[('parameterize_uxarts', (('USART', 2),))].replayed)
+        self.assertTrue(result.stats[('parameterize_scgu',)].replayed)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest, tempfile, pathlib, sys, importlib, sqlite3, contextlib, pickle
+
+
+
+# See `test_lockfile.py`.
+
+directory = tempfile.TemporaryDirectory()
+
+pathlib.Path(directory.name, 'deps').mkdir()
+pathlib.Path(directory.name, 'deps', 'stpy').symlink_to(pathlib.Path(__file__).resolve().parent.parent, target_is_directory = True)
+sys.path.insert(0, directory.name)
+
+parameterization = importlib.import_module('deps.stpy.parameterization')
+mcus             = importlib.import_module('deps.stpy.mcus')
+
+
+
+SCHEMA = {
+    'HSI_ENABLE' : True,
+    'PLL1P_CK'   : 250_000_000,
+    'PLL1Q_CK'   : 125_000_000,
+    'PLL2P_CK'   : 200_000_000,
+    'CPU_CK'     : 250_000_000,
+    'APB1_CK'    : 250_000_000,
+    'APB2_CK'    : 250_000_000,
+    'APB3_CK'    : 250_000_000,
+}
+
+
+
+# A PLL cache file with solutions that can't be used
+# should just be treated as not having them cached.
+
+class PLLCacheTests(unittest.TestCase):
+
+
+
+    def setUp(self):
+        self.path = pathlib.Path(directory.name, 'plls.sqlite')
+        self.path.unlink(missing_ok = True)
+        parameterization.PLLCache.memory.clear()
+
+
+
+    def parameterize(self, **options):
+
+        result = parameterization.Parameterization(
+            'target',
+            'STM32H533RET6',
+            dict(SCHEMA),
+            (),
+            (),
+            **options
+        )
+
+        return {
+            key : value
+            for key, value in result.determined.items()
+            if value is not mcus.TBD
+        }
+
+
+
+    def test_corrupted_solutions(self):
+
+        expected = self.parameterize(pll_cache = False)
+
+        for solution in (b'\x80\x05garbage', b'', pickle.dumps(42), pickle.dumps([1, 2])):
+            with self.subTest(solution = solution):
+
+                self.assertEqual(self.parameterize(pll_cache_path = self.path), expected)
+
+                with contextlib.closing(sqlite3.connect(self.path)) as connection, connection:
+                    connection.execute('UPDATE solutions SET solution = ?', (solution,))
+
+                parameterization.PLLCache.memory.clear()
+
+                self.assertEqual(self.parameterize(pll_cache_path = self.path), expected)
+
+
+
+    def test_garbage_file(self):
+
+        expected = self.parameterize(pll_cache = False)
+
+        self.path.write_bytes(b'not a database')
+
+        self.assertEqual(self.parameterize(pll_cache_path = self.path), expected)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
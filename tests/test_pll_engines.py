@@ -0,0 +1,91 @@
+import unittest, tempfile, pathlib, sys, importlib, importlib.util
+
+
+
+# See `test_lockfile.py`.
+
+directory = tempfile.TemporaryDirectory()
+
+pathlib.Path(directory.name, 'deps').mkdir()
+pathlib.Path(directory.name, 'deps', 'stpy').symlink_to(pathlib.Path(__file__).resolve().parent.parent, target_is_directory = True)
+sys.path.insert(0, directory.name)
+
+parameterization = importlib.import_module('deps.stpy.parameterization')
+mcus             = importlib.import_module('deps.stpy.mcus')
+
+
+
+BASE = {
+    'HSI_ENABLE' : True,
+    'CPU_CK'     : 32_000_000,
+    'APB1_CK'    : 32_000_000,
+    'APB2_CK'    : 32_000_000,
+    'APB3_CK'    : 32_000_000,
+}
+
+# The scalar engine can only solve analytically with integer frequencies;
+# otherwise, it falls back to searching exhaustively.
+
+PLANS = {
+    'typical'        : { 'PLL1P_CK' : 250_000_000, 'PLL1Q_CK' : 125_000_000, 'PLL2P_CK' : 200_000_000, 'PLL2Q_CK' : 100_000_000, 'PLL3R_CK' : 80_000_000 },
+    'system'         : { 'PLL1P_CK' : 250_000_000, 'CPU_CK' : 250_000_000, 'APB1_CK' : 125_000_000, 'APB2_CK' : 125_000_000, 'APB3_CK' : 125_000_000 },
+    'audio'          : { 'PLL2P_CK' : 12_288_000 },
+    'csi'            : { 'CSI_ENABLE' : True, 'PLL3P_CK' : 48_000_000, 'PLL3Q_CK' : 12_000_000 },
+    'non-integer'    : { 'PLL1P_CK' : 64_000_000 / 3 * 25 / 4 },
+    'infeasible'     : { 'PLL1P_CK' : 133_000_000, 'PLL1Q_CK' : 250_000_000 },
+    'infeasible too' : { 'PLL2P_CK' : 12_288_000 , 'PLL2Q_CK' : 49_152_000 },
+}
+
+
+
+# The NumPy engine is just another way of going through the same
+# search space, so it should end up with the exact same parameterization.
+
+@unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy is not installed.')
+class PLLEngineTests(unittest.TestCase):
+
+
+
+    def parameterize(self, plan, engine):
+
+        try:
+            result = parameterization.Parameterization(
+                'target',
+                'STM32H533RET6',
+                { **BASE, **plan },
+                (),
+                (),
+                pll_engine = engine,
+                pll_cache  = False,
+            )
+        except RuntimeError:
+            return None
+
+        return {
+            key : value
+            for key, value in result.determined.items()
+            if value is not mcus.TBD
+        }
+
+
+
+    def test_engines_agree(self):
+
+        for name, plan in PLANS.items():
+            with self.subTest(plan = name):
+
+                scalar = self.parameterize(plan, 'scalar')
+                numpy  = self.parameterize(plan, 'numpy' )
+
+                self.assertEqual(numpy, scalar)
+
+                if name.startswith('infeasible'):
+                    self.assertIsNone(scalar)
+                else:
+                    self.assertIsNotNone(scalar)
+                    self.assertTrue(any(str(key).endswith('_MULTIPLIER') for key in scalar))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
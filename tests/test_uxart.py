@@ -0,0 +1,154 @@
+import unittest, tempfile, pathlib, sys, importlib, types
+
+
+
+# See `test_lockfile.py`.
+
+directory = tempfile.TemporaryDirectory()
+
+pathlib.Path(directory.name, 'deps').mkdir()
+pathlib.Path(directory.name, 'deps', 'stpy').symlink_to(pathlib.Path(__file__).resolve().parent.parent, target_is_directory = True)
+sys.path.insert(0, directory.name)
+
+parameterization = importlib.import_module('deps.stpy.parameterization')
+mcus             = importlib.import_module('deps.stpy.mcus')
+
+
+
+SCHEMA = {
+    'HSI_ENABLE' : True,
+    'PLL1P_CK'   : 250_000_000,
+    'CPU_CK'     : 250_000_000,
+    'APB1_CK'    : 250_000_000,
+    'APB2_CK'    : 250_000_000,
+    'APB3_CK'    : 250_000_000,
+}
+
+KERNEL_SOURCE = 'UXART_((\'USART\', 2),)_KERNEL_SOURCE'
+
+
+
+class UXARTTests(unittest.TestCase):
+
+
+
+    # Get the USART2 configuration with the mapped
+    # values (e.g. the prescaler) decoded back.
+
+    def parameterize(self, baud):
+
+        result = parameterization.Parameterization(
+            'target',
+            'STM32H533RET6',
+            { **SCHEMA, 'USART2_BAUD' : baud },
+            (),
+            (),
+            pll_cache = False,
+        )
+
+        def decode(key):
+
+            constraint = mcus.MCUS['STM32H533RET6'][key].constraint
+
+            return {
+                code : value
+                for value, code in constraint.dictionary.items()
+            }[result(key)]
+
+        return types.SimpleNamespace(
+            kernel_source = decode(KERNEL_SOURCE),
+            presc         = decode('USART2_PRESC'),
+            oversampling  = decode('USART2_OVERSAMPLING'),
+            brr           = result('USART2_BAUD_DIVIDER'),
+            error         = result('USART2_BAUD_ERROR'),
+            kernel_ck     = result(decode(KERNEL_SOURCE)),
+        )
+
+
+
+    # The actual baud should be what the error says it is.
+
+    def assertBaud(self, configuration, baud):
+
+        if configuration.oversampling == 8:
+            usartdiv = (configuration.brr & ~0b1111) | ((configuration.brr & 0b0111) << 1)
+        else:
+            usartdiv = configuration.brr
+
+        actual_baud = configuration.kernel_ck / configuration.presc * (16 / configuration.oversampling) / usartdiv
+
+        self.assertAlmostEqual(abs(1 - actual_baud / baud), configuration.error, delta = 1e-12)
+        self.assertLessEqual(configuration.error, 0.005)
+
+
+
+    # 250MHz / 25Mbaud would need a USARTDIV of 10 with oversampling
+    # by 16, which is below the minimum of 16; with oversampling by 8,
+    # USARTDIV is 20 (0x14), so BRR is 0x10 | (0x4 >> 1).
+
+    def test_oversampling_by_8(self):
+
+        configuration = self.parameterize(25_000_000)
+
+        self.assertEqual(configuration.kernel_source, 'APB1_CK')
+        self.assertEqual(configuration.presc        , 1        )
+        self.assertEqual(configuration.oversampling , 8        )
+        self.assertEqual(configuration.brr          , 0x12     )
+        self.assertBaud(configuration, 25_000_000)
+
+
+
+    # 250MHz / 23.8Mbaud would need a USARTDIV of 21 with oversampling
+    # by 8, but BRR can't hold the lowest bit of it, and 20 or 22 is
+    # way off; no other kernel source is fast enough either.
+
+    def test_oversampling_by_8_needs_even_divider(self):
+        with self.assertRaises(RuntimeError):
+            self.parameterize(round(250_000_000 * 2 / 21))
+
+
+
+    # 250MHz / 300baud is too much for a 16-bit USARTDIV, and so is
+    # HSI's 32MHz, so the prescaler has to be brought in.
+
+    def test_prescaler(self):
+
+        configuration = self.parameterize(300)
+
+        self.assertEqual(configuration.kernel_source, 'APB1_CK')
+        self.assertEqual(configuration.presc        , 16       )
+        self.assertEqual(configuration.oversampling , 16       )
+        self.assertEqual(configuration.brr          , 52083    )
+        self.assertBaud(configuration, 300)
+
+
+
+    # 250MHz / 1200baud is too much for a 16-bit USARTDIV, but HSI
+    # can do it without the prescaler, so that's what gets used.
+
+    def test_another_kernel_source_before_prescaler(self):
+
+        configuration = self.parameterize(1200)
+
+        self.assertEqual(configuration.kernel_source, 'HSI_CK')
+        self.assertEqual(configuration.presc        , 1       )
+        self.assertEqual(configuration.oversampling , 16      )
+        self.assertEqual(configuration.brr          , 26667   )
+        self.assertBaud(configuration, 1200)
+
+
+
+    def test_oversampling_by_16(self):
+
+        configuration = self.parameterize(115200)
+
+        self.assertEqual(configuration.kernel_source, 'APB1_CK')
+        self.assertEqual(configuration.presc        , 1        )
+        self.assertEqual(configuration.oversampling , 16       )
+        self.assertEqual(configuration.brr          , 2170     )
+        self.assertBaud(configuration, 115200)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
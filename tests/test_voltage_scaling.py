@@ -0,0 +1,85 @@
+import unittest, tempfile, pathlib, sys, importlib
+
+
+
+# See `test_lockfile.py`.
+
+directory = tempfile.TemporaryDirectory()
+
+pathlib.Path(directory.name, 'deps').mkdir()
+pathlib.Path(directory.name, 'deps', 'stpy').symlink_to(pathlib.Path(__file__).resolve().parent.parent, target_is_directory = True)
+sys.path.insert(0, directory.name)
+
+parameterization = importlib.import_module('deps.stpy.parameterization')
+mcus             = importlib.import_module('deps.stpy.mcus')
+
+
+
+SCHEMA = {
+    'HSI_ENABLE' : True,
+    'CPU_CK'     : 32_000_000,
+    'APB1_CK'    : 32_000_000,
+    'APB2_CK'    : 32_000_000,
+    'APB3_CK'    : 32_000_000,
+}
+
+
+
+class VoltageScalingTests(unittest.TestCase):
+
+
+
+    def parameterize(self, **schema):
+
+        result = parameterization.Parameterization(
+            'target',
+            'STM32H533RET6',
+            { **SCHEMA, **schema },
+            (),
+            (),
+            pll_cache = False,
+        )
+
+        voltage_scalings = {
+            code : voltage_scaling
+            for voltage_scaling, code in mcus.MCUS['STM32H533RET6']['INTERNAL_VOLTAGE_SCALING'].constraint.dictionary.items()
+        }
+
+        return voltage_scalings[result('INTERNAL_VOLTAGE_SCALING')], result('FLASH_LATENCY')
+
+
+
+    # At 32MHz, VOS3 is the lowest voltage scaling, but it needs a wait-state.
+
+    def test_power(self):
+        self.assertEqual(self.parameterize(), ('VOS3', 1))
+        self.assertEqual(self.parameterize(INTERNAL_VOLTAGE_SCALING_PREFERENCE = 'POWER'), ('VOS3', 1))
+
+
+
+    # VOS1 is the lowest voltage scaling that doesn't need a wait-state at 32MHz.
+
+    def test_flash_latency(self):
+        self.assertEqual(self.parameterize(INTERNAL_VOLTAGE_SCALING_PREFERENCE = 'FLASH_LATENCY'), ('VOS1', 0))
+
+
+
+    # At 250MHz, only VOS0 fits anyways.
+
+    def test_fastest(self):
+
+        schema = {
+            'PLL1P_CK' : 250_000_000,
+            'CPU_CK'   : 250_000_000,
+            'APB1_CK'  : 250_000_000,
+            'APB2_CK'  : 250_000_000,
+            'APB3_CK'  : 250_000_000,
+        }
+
+        self.assertEqual(self.parameterize(**schema), ('VOS0', 5))
+        self.assertEqual(self.parameterize(**schema, INTERNAL_VOLTAGE_SCALING_PREFERENCE = 'FLASH_LATENCY'), ('VOS0', 5))
+
+
+
+if __name__ == '__main__':
+    unittest.main()